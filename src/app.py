@@ -9,10 +9,11 @@ from logging.handlers import RotatingFileHandler
 import asyncio
 import logging
 import os
+import time
 
 from .config import Config
 from .services import AsyncRTSPProcessingService
-from .image_capture import capture_frame_from_rtsp
+from .image_capture import LatestFrameCapture
 from .health_checks import run_health_checks
 
 # Ensure logs directory exists first
@@ -35,6 +36,27 @@ logging.basicConfig(
 )
 
 
+async def _frame_worker(service: AsyncRTSPProcessingService, queue: asyncio.Queue,
+                        free_frames: list) -> None:
+    """Process queued frames one at a time until the None sentinel arrives.
+
+    Each processed frame is returned to free_frames for the capture loop to reuse.
+    A failure while processing one frame is logged and skipped so the worker
+    keeps consuming the queue.
+    """
+    while True:
+        frame = await queue.get()
+        try:
+            if frame is None:
+                return
+            await service.process_frame_async(frame)
+        except Exception:  # pylint: disable=broad-exception-caught
+            logging.exception("Frame processing failed")
+        finally:
+            queue.task_done()
+        free_frames.append(frame)
+
+
 async def main_async() -> None:
     """
     Main async service loop for image capture, analysis, and broadcast.
@@ -47,20 +69,58 @@ async def main_async() -> None:
     service = AsyncRTSPProcessingService()
     logging.info("Starting async image capture and analysis system...")
 
+    queue: asyncio.Queue = asyncio.Queue(maxsize=Config.FRAME_QUEUE_SIZE)
+    # Buffers no longer queued or being processed; captures decode into them
+    # instead of allocating a new frame each time
+    free_frames: list = []
+    worker = asyncio.create_task(_frame_worker(service, queue, free_frames))
+    # Keep one connection open; a background thread tracks the live frame
+    capture = LatestFrameCapture(service.config.RTSP_URL)
+    interval = service.config.CAPTURE_INTERVAL
+    deadline = time.monotonic()
+
     try:
         while True:
-            success, frame = capture_frame_from_rtsp(service.config.RTSP_URL)
+            buffer = free_frames.pop() if free_frames else None
+            success, frame = await asyncio.to_thread(capture.read, out=buffer)
             if success and frame is not None:
-                # Process frame asynchronously without blocking
-                asyncio.create_task(service.process_frame_async(frame))
-            await asyncio.sleep(service.config.CAPTURE_INTERVAL)
+                if queue.full():
+                    # Processing is behind; drop the stalest frame
+                    free_frames.append(queue.get_nowait())
+                    queue.task_done()
+                    logging.debug("Frame queue full, dropped oldest frame")
+                queue.put_nowait(frame)
+            elif buffer is not None:
+                free_frames.append(buffer)
+            # Sleep until the next capture slot so capture time doesn't stretch the interval
+            deadline += interval
+            delay = deadline - time.monotonic()
+            if delay < 0:
+                # Running behind; don't burst to catch up on missed slots
+                deadline -= delay
+                delay = 0
+            await asyncio.sleep(delay)
     except KeyboardInterrupt:
         logging.info("Shutting down...")
+    finally:
+        # Discard frames still waiting so shutdown waits only on the in-flight one
+        while not queue.empty():
+            queue.get_nowait()
+            queue.task_done()
+        queue.put_nowait(None)
+        await worker
+        capture.release()
 
 
 def main() -> None:
     """Sync wrapper for backward compatibility."""
-    asyncio.run(main_async())
+    try:
+        # libuv-based event loop; not available on Windows
+        import uvloop
+    except ImportError:
+        asyncio.run(main_async())
+    else:
+        uvloop.run(main_async())
 
 
 if __name__ == "__main__":
@@ -3,9 +3,12 @@ computer_vision.py
 
 This module provides computer vision utilities, including YOLOv8-based person detection.
 """
+import atexit
+import multiprocessing
 import threading
+from concurrent.futures import ProcessPoolExecutor
 
-from ultralytics import YOLO
+import numpy as np
 
 # Singleton YOLOv8 model loader
 
@@ -31,8 +34,11 @@ class YOLOv8ModelSingleton:
         if model_path not in cls._instances:
             with cls._lock:
                 if model_path not in cls._instances:
+                    # Deferred: importing ultralytics pulls in torch
+                    from ultralytics import YOLO
                     instance = super().__new__(cls)
-                    instance._model = YOLO(model_path)
+                    # task is required to load exported (e.g. OpenVINO) models
+                    instance._model = YOLO(model_path, task="detect")
                     cls._instances[model_path] = instance
         return cls._instances[model_path]
 
@@ -47,6 +53,99 @@ class YOLOv8ModelSingleton:
         return self._model
 
 
+def export_int8_yolov8(model_path='yolov8n.pt', imgsz=640) -> str:
+    """
+    Exports an INT8-quantized OpenVINO copy of a YOLOv8 model for faster CPU inference.
+
+    Point YOLO_MODEL_PATH at the returned directory to use it for detection.
+    Requires the optional packages in requirements-openvino.txt; INT8
+    calibration downloads Ultralytics' coco8 sample dataset on first use.
+
+    Args:
+        model_path (str): Path to the YOLOv8 model weights file.
+        imgsz (int): Inference image size used for export and calibration.
+
+    Returns:
+        str: Path to the exported model directory.
+    """
+    from ultralytics import YOLO
+    return YOLO(model_path).export(format="openvino", int8=True, imgsz=imgsz)
+
+
+_process_pools = {}
+_process_pool_lock = threading.Lock()
+
+
+def _warm_yolov8_worker(model_path: str) -> None:
+    """Load the YOLOv8 model once when a worker process starts."""
+    YOLOv8ModelSingleton(model_path)
+
+
+def get_yolov8_process_pool(model_path='yolov8n.pt') -> ProcessPoolExecutor:
+    """
+    Returns a single-worker process pool with a warm YOLOv8 model.
+
+    Running inference in a dedicated process keeps PyTorch off the main
+    interpreter's GIL when several frames are processed concurrently.
+
+    Args:
+        model_path (str): Path to the YOLOv8 model weights file.
+
+    Returns:
+        ProcessPoolExecutor: Executor to submit person_confidence_yolov8_frame to.
+    """
+    if model_path not in _process_pools:
+        with _process_pool_lock:
+            if model_path not in _process_pools:
+                pool = ProcessPoolExecutor(
+                    max_workers=1,
+                    # Forking after torch has started threads is unsafe
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_warm_yolov8_worker,
+                    initargs=(model_path,),
+                )
+                atexit.register(pool.shutdown)
+                _process_pools[model_path] = pool
+    return _process_pools[model_path]
+
+
+def _best_person_confidence(boxes, names) -> float:
+    """
+    Returns the highest person confidence among a result's detection boxes.
+
+    Filters the class and confidence arrays in one vectorized pass rather than
+    iterating over the boxes in Python.
+
+    Args:
+        boxes: ultralytics Boxes for a single result.
+        names (dict): Mapping of class id to class name from the model.
+
+    Returns:
+        float: Highest person confidence, or 0.0 if no person box is present.
+    """
+    boxes = boxes.cpu().numpy()
+    person_ids = [class_id for class_id, name in names.items() if name == 'person']
+    mask = np.isin(boxes.cls.astype(int), person_ids)
+    return float(boxes.conf[mask].max()) if mask.any() else 0.0
+
+
+def person_confidence_yolov8_frame(frame, model_path='yolov8n.pt') -> float:
+    """
+    Returns the highest YOLOv8 confidence for a person in the given cv2 frame.
+
+    Args:
+        frame: cv2 image array.
+        model_path (str): Path to the YOLOv8 model weights file.
+
+    Returns:
+        float: Highest person confidence in [0, 1], or 0.0 if no person is detected.
+    """
+    model = YOLOv8ModelSingleton(model_path).model
+    results = model(frame)
+    return max((_best_person_confidence(_result.boxes, model.names) for _result in results),
+               default=0.0)
+
+
 def person_detected_yolov8_frame(frame, model_path='yolov8n.pt') -> bool:
     """
     Detects whether a person is present in the given cv2 frame using YOLOv8.
@@ -58,15 +157,7 @@ def person_detected_yolov8_frame(frame, model_path='yolov8n.pt') -> bool:
     Returns:
         bool: True if a person is detected in the frame, False otherwise.
     """
-    model = YOLOv8ModelSingleton(model_path).model
-    results = model(frame)
-    for _result in results:
-        for box in _result.boxes:
-            class_id = int(box.cls[0])
-            class_name = model.names[class_id]
-            if class_name == 'person':
-                return True
-    return False
+    return person_confidence_yolov8_frame(frame, model_path) > 0.0
 
 
 def person_detected_yolov8(image_path, model_path='yolov8n.pt') -> bool:
@@ -82,10 +173,4 @@ def person_detected_yolov8(image_path, model_path='yolov8n.pt') -> bool:
     """
     model = YOLOv8ModelSingleton(model_path).model
     results = model(image_path)
-    for _result in results:
-        for box in _result.boxes:
-            class_id = int(box.cls[0])
-            class_name = model.names[class_id]
-            if class_name == 'person':
-                return True
-    return False
+    return any(_best_person_confidence(_result.boxes, model.names) > 0.0 for _result in results)
@@ -5,10 +5,20 @@ Centralized configuration management for the RTSP processing system.
 Loads and validates environment variables and provides a config object.
 """
 import os
+import re
+
 from dotenv import load_dotenv
 
 load_dotenv()
 
+_RTSP_URL_RE = re.compile(r'^(?:rtsps?|https?)://', re.IGNORECASE)
+RTSP_URL_SCHEME_ERROR = "RTSP URL must start with rtsp://, rtsps://, http://, or https://"
+
+
+def is_supported_rtsp_url(url) -> bool:
+    """Return True if url is a string with a scheme the capture code can open."""
+    return isinstance(url, str) and _RTSP_URL_RE.match(url) is not None
+
 
 class Config:
     """
@@ -18,6 +28,7 @@ class Config:
     # RTSP Settings
     RTSP_URL = os.getenv("RTSP_URL")
     CAPTURE_INTERVAL = int(os.getenv("CAPTURE_INTERVAL", "10"))
+    FRAME_QUEUE_SIZE = int(os.getenv("FRAME_QUEUE_SIZE", "2"))
 
     # Notification Settings
     NOTIFICATION_TARGET = os.getenv("NOTIFICATION_TARGET", "both")
@@ -30,6 +41,7 @@ class Config:
     DEFAULT_LLM_PROVIDER = os.getenv("LLM_PROVIDER", "openai")
     DEFAULT_LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4o-mini")
     LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.1"))
+    LLM_BATCH_SIZE = int(os.getenv("LLM_BATCH_SIZE", "8"))
 
     # Storage Settings
     IMAGES_DIR = os.getenv("IMAGES_DIR", "images")
@@ -37,6 +49,17 @@ class Config:
     BROADCAST_MESSAGE_TEMPLATE = os.getenv(
         "BROADCAST_MESSAGE_TEMPLATE", "Person detected: {desc}")
     YOLO_MODEL_PATH = os.getenv("YOLO_MODEL_PATH", "yolov8n.pt")
+    # Person detections below the first threshold are dropped; at or above
+    # the second they are accepted without an LLM call
+    YOLO_MIN_CONFIDENCE = float(os.getenv("YOLO_MIN_CONFIDENCE", "0.35"))
+    YOLO_CONFIDENT_THRESHOLD = float(
+        os.getenv("YOLO_CONFIDENT_THRESHOLD", "0.85"))
+    YOLO_INPUT_SIZE = int(os.getenv("YOLO_INPUT_SIZE", "640"))
+    YOLO_WORKER_PROCESS = os.getenv(
+        "YOLO_WORKER_PROCESS", "false").lower() in ("1", "true", "yes")
+    JPEG_QUALITY = int(os.getenv("JPEG_QUALITY", "80"))
+    # Longest side of frames encoded for the LLM and saved captures; 0 keeps full size
+    LLM_IMAGE_MAX_DIM = int(os.getenv("LLM_IMAGE_MAX_DIM", "1024"))
 
     # Timeout and Retry Settings
     RTSP_TIMEOUT = int(os.getenv("RTSP_TIMEOUT", "10"))
@@ -47,6 +70,8 @@ class Config:
 
     # Magic Numbers
     CV_BUFFER_SIZE = 1
+    CV_STALE_FRAMES = 2  # Frames grabbed and discarded before retrieve()
+    CV_NUM_THREADS = int(os.getenv("CV_NUM_THREADS", "1"))
     SLEEP_INTERVAL = 1
     TIMEOUT_MULTIPLIER = 1000
 
@@ -79,8 +104,8 @@ class Config:
         # Required fields
         if not cls.RTSP_URL:
             errors.append("RTSP_URL is required")
-        elif not cls.RTSP_URL.startswith(('rtsp://', 'http://', 'https://')):
-            errors.append("RTSP_URL must be a valid URL")
+        elif not is_supported_rtsp_url(cls.RTSP_URL):
+            errors.append(RTSP_URL_SCHEME_ERROR)
 
         if not cls.GOOGLE_DEVICE_IP:
             errors.append("GOOGLE_DEVICE_IP is required")
@@ -95,12 +120,31 @@ class Config:
         if not 0.0 <= cls.LLM_TEMPERATURE <= 2.0:
             errors.append("LLM_TEMPERATURE must be between 0.0 and 2.0")
 
+        if not 0.0 <= cls.YOLO_MIN_CONFIDENCE <= 1.0:
+            errors.append("YOLO_MIN_CONFIDENCE must be between 0.0 and 1.0")
+
+        if cls.YOLO_CONFIDENT_THRESHOLD < cls.YOLO_MIN_CONFIDENCE:
+            errors.append(
+                "YOLO_CONFIDENT_THRESHOLD must not be below YOLO_MIN_CONFIDENCE")
+
         if cls.CAPTURE_INTERVAL <= 0:
             errors.append("CAPTURE_INTERVAL must be positive")
 
         if cls.MAX_IMAGES <= 0:
             errors.append("MAX_IMAGES must be positive")
 
+        if cls.FRAME_QUEUE_SIZE <= 0:
+            errors.append("FRAME_QUEUE_SIZE must be positive")
+
+        if cls.LLM_BATCH_SIZE <= 0:
+            errors.append("LLM_BATCH_SIZE must be positive")
+
+        if cls.YOLO_INPUT_SIZE <= 0:
+            errors.append("YOLO_INPUT_SIZE must be positive")
+
+        if cls.CV_NUM_THREADS < -1:
+            errors.append("CV_NUM_THREADS must be 0 or more, or -1 for the OpenCV default")
+
         # File path validation
         if not os.path.exists(cls.YOLO_MODEL_PATH):
             errors.append(f"YOLO model file not found: {cls.YOLO_MODEL_PATH}")
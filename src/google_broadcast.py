@@ -4,7 +4,9 @@ google_broadcast.py
 Broadcasts a text-to-speech message to a Google Hub or compatible Chromecast device.
 """
 
+import atexit
 import logging
+import threading
 import time
 import urllib.parse
 from uuid import uuid4
@@ -14,6 +16,8 @@ import zeroconf
 from pychromecast.discovery import CastBrowser, SimpleCastListener
 from pychromecast.models import CastInfo, HostServiceInfo
 
+from .config import Config
+
 
 class CollectingCastListener(SimpleCastListener):
     """
@@ -23,12 +27,20 @@ class CollectingCastListener(SimpleCastListener):
     access to device information through the browser's device registry.
     """
 
-    def __init__(self):
-        """Initialize the listener with empty device list and service tracking."""
+    def __init__(self, target_ip: str = None):
+        """
+        Initialize the listener with empty device list and service tracking.
+
+        Args:
+            target_ip (str, optional): If set, target_found is signalled as
+                soon as a device with this IP address resolves.
+        """
         super().__init__()
         self.devices = []
         self.seen_services = set()
         self.browser = None  # Will be set by the discover function
+        self.target_ip = target_ip
+        self.target_found = threading.Event()
 
     def add_service(self, _zconf, _type_, name):
         """
@@ -82,6 +94,8 @@ class CollectingCastListener(SimpleCastListener):
                 logging.debug("Device resolved and added: %s (%s)",
                               cast_info.friendly_name, cast_info.host)
                 self.devices.append(cast)
+            if self.target_ip and cast_info.host == self.target_ip:
+                self.target_found.set()
         else:
             logging.debug(
                 "add_cast called but cast not found in browser.devices for uuid: %s, service: %s", uuid, service)
@@ -133,13 +147,18 @@ class MediaStatusListener:
             self.message_played = True
 
 
-def discover_all_chromecasts():
+def discover_all_chromecasts(target_ip: str = None, discovery_timeout: float = 15):
     """
     Discover and list all available Chromecast devices on the network.
 
     Uses CastBrowser with a custom listener to discover Google Cast devices.
-    Waits 15 seconds for comprehensive device discovery, which is optimized
-    for Windows environments where mDNS discovery can be slower.
+    Waits up to 15 seconds for comprehensive device discovery, which is optimized
+    for Windows environments where mDNS discovery can be slower. When target_ip
+    is given, discovery stops as soon as that device resolves.
+
+    Args:
+        target_ip (str, optional): IP address of a device to stop early for.
+        discovery_timeout (float): Maximum seconds to wait for discovery.
 
     Returns:
         dict: Dictionary mapping device IP addresses to MockCast objects.
@@ -151,7 +170,7 @@ def discover_all_chromecasts():
     """
     logging.info("Starting device discovery with CastBrowser...")
 
-    listener = CollectingCastListener()
+    listener = CollectingCastListener(target_ip)
     zconf = zeroconf.Zeroconf()
     browser = CastBrowser(listener, zconf)
 
@@ -160,11 +179,15 @@ def discover_all_chromecasts():
 
     try:
         browser.start_discovery()
-        # Increase timeout for more robust discovery, especially on Windows
-        discovery_timeout = 15
-        logging.info("Waiting %d seconds for device discovery...",
+        # Generous timeout for more robust discovery, especially on Windows
+        logging.info("Waiting up to %d seconds for device discovery...",
                      discovery_timeout)
-        time.sleep(discovery_timeout)
+        if target_ip:
+            if listener.target_found.wait(discovery_timeout):
+                logging.info("Found target device %s, stopping discovery early",
+                             target_ip)
+        else:
+            time.sleep(discovery_timeout)
     finally:
         browser.stop_discovery()
         zconf.close()
@@ -190,10 +213,110 @@ def discover_all_chromecasts():
     return {cast.cast_info.host: cast for cast in chromecasts}
 
 
+_cast_cache: dict[tuple[str, int], pychromecast.Chromecast] = {}
+_cast_cache_lock = threading.Lock()
+_zconf = None
+
+
+def _close_cast_connections() -> None:
+    """Disconnect cached Chromecast connections and close the shared zeroconf."""
+    global _zconf
+    with _cast_cache_lock:
+        for cast in _cast_cache.values():
+            _disconnect_quietly(cast)
+        _cast_cache.clear()
+        if _zconf is not None:
+            _zconf.close()
+            _zconf = None
+
+
+atexit.register(_close_cast_connections)
+
+
+def _get_chromecast(device_ip: str, port: int, friendly_name: str) -> pychromecast.Chromecast:
+    """
+    Return a connected Chromecast for the device, reusing a cached connection.
+
+    The cache lock is held only to look up and publish connections, so a slow
+    or unreachable device never blocks broadcasts to other devices or shutdown.
+
+    Args:
+        device_ip (str): The IP address of the target Google device.
+        port (int): Port number for the Chromecast device.
+        friendly_name (str): Friendly name for the device (for logging).
+
+    Returns:
+        pychromecast.Chromecast: A connected Chromecast instance.
+
+    Raises:
+        pychromecast.error.RequestTimeout: If the device is not ready within
+            Config.CHROMECAST_TIMEOUT seconds.
+    """
+    global _zconf
+    key = (device_ip, port)
+    with _cast_cache_lock:
+        chromecast = _cast_cache.get(key)
+        if chromecast is not None:
+            return chromecast
+        if _zconf is None:
+            _zconf = zeroconf.Zeroconf()
+        zconf = _zconf
+
+    # Create CastInfo for the known device
+    services = {HostServiceInfo(device_ip, port)}
+    cast_info = CastInfo(
+        services=services,
+        uuid=uuid4(),  # Generate a temporary UUID
+        model_name="Unknown",
+        friendly_name=friendly_name,
+        host=device_ip,
+        port=port,
+        cast_type=None,
+        manufacturer=None
+    )
+
+    # Connect to the Chromecast device
+    logging.info("Connecting to %s (%s:%d)...",
+                 friendly_name, device_ip, port)
+    chromecast = pychromecast.Chromecast(cast_info, zconf=zconf)
+
+    # Wait for the device to be ready
+    try:
+        chromecast.wait(timeout=Config.CHROMECAST_TIMEOUT)
+    except BaseException:
+        _disconnect_quietly(chromecast)
+        raise
+    logging.info("Connected successfully to %s", friendly_name)
+
+    with _cast_cache_lock:
+        cached = _cast_cache.setdefault(key, chromecast)
+    if cached is not chromecast:
+        # Another thread connected to the same device first; keep its connection
+        _disconnect_quietly(chromecast)
+    return cached
+
+
+def _disconnect_quietly(chromecast: pychromecast.Chromecast) -> None:
+    """Disconnect a Chromecast, ignoring errors from an already-broken connection."""
+    try:
+        chromecast.disconnect()
+    except (AttributeError, ConnectionError, OSError):
+        pass
+
+
+def _evict_chromecast(device_ip: str, port: int) -> None:
+    """Drop and disconnect a cached Chromecast connection, if any."""
+    with _cast_cache_lock:
+        chromecast = _cast_cache.pop((device_ip, port), None)
+    if chromecast is not None:
+        _disconnect_quietly(chromecast)
+
+
 def send_message_to_google_hub(message: str, device_ip: str, volume: float = 1.0, port: int = 8009, friendly_name: str = "Google Hub Device") -> bool:
     """
     Sends a text-to-speech message directly to a Google Hub or compatible Chromecast device.
-    Uses direct connection approach for better reliability.
+    Uses direct connection approach for better reliability. The connection is
+    cached per device and reused by later calls; a failed broadcast reconnects once.
 
     Args:
         message (str): The message to broadcast as speech.
@@ -221,65 +344,53 @@ def send_message_to_google_hub(message: str, device_ip: str, volume: float = 1.0
     logging.info("Broadcasting directly to %s (%s)...",
                  friendly_name, device_ip)
 
-    # Create a new zeroconf instance for the broadcast
-    zconf = zeroconf.Zeroconf()
-
-    try:
-        # Create CastInfo for the known device
-        services = {HostServiceInfo(device_ip, port)}
-        cast_info = CastInfo(
-            services=services,
-            uuid=uuid4(),  # Generate a temporary UUID
-            model_name="Unknown",
-            friendly_name=friendly_name,
-            host=device_ip,
-            port=port,
-            cast_type=None,
-            manufacturer=None
-        )
-
-        # Connect to the Chromecast device
-        logging.info("Connecting to %s (%s:%d)...",
-                     friendly_name, device_ip, port)
-        chromecast = pychromecast.Chromecast(cast_info, zconf=zconf)
-
-        # Wait for the device to be ready
-        chromecast.wait()
-        logging.info("Connected successfully to %s", friendly_name)
-
-        # Set volume after connection is established
-        chromecast.set_volume(volume)
-
-        # Start the default media receiver app
-        mc = chromecast.media_controller
-
-        # Use better TTS URL with improved parameters
-        tts_url = f"https://translate.google.com/translate_tts?ie=UTF-8&q={urllib.parse.quote(message)}&tl=en&client=tw-ob&ttsspeed=0.24&total=1&idx=0"
-
-        logging.info("Broadcasting message: '%s'", message)
-        mc.play_media(tts_url, 'audio/mpeg')
-        mc.block_until_active()
-
-        # Wait for playback to complete
-        time.sleep(3)
-        timeout = 30
-        start_time = time.time()
-        while mc.status.player_state in ['BUFFERING', 'PLAYING'] and (time.time() - start_time) < timeout:
-            time.sleep(0.5)
-
-        logging.info("Message broadcast successfully!")
-        return True
-
-    except (ConnectionError, OSError, pychromecast.error.ChromecastConnectionError) as e:
-        logging.error("Failed to broadcast message: %s", e)
-        return False
-    finally:
+    for attempt in range(2):
+        chromecast = None
         try:
-            chromecast.quit_app()
-        except (AttributeError, ConnectionError):
-            pass
+            chromecast = _get_chromecast(device_ip, port, friendly_name)
+
+            # Set volume after connection is established
+            chromecast.set_volume(volume)
+
+            # Start the default media receiver app
+            mc = chromecast.media_controller
+
+            # Use better TTS URL with improved parameters
+            tts_url = f"https://translate.google.com/translate_tts?ie=UTF-8&q={urllib.parse.quote(message)}&tl=en&client=tw-ob&ttsspeed=0.24&total=1&idx=0"
+
+            logging.info("Broadcasting message: '%s'", message)
+            mc.play_media(tts_url, 'audio/mpeg')
+            mc.block_until_active()
+
+            # Wait for playback to complete
+            time.sleep(3)
+            timeout = 30
+            start_time = time.monotonic()
+            while mc.status.player_state in ['BUFFERING', 'PLAYING'] and (time.monotonic() - start_time) < timeout:
+                time.sleep(0.5)
+
+            logging.info("Message broadcast successfully!")
+            return True
+
+        except (ConnectionError, OSError, pychromecast.error.ChromecastConnectionError,
+                pychromecast.error.RequestTimeout) as e:
+            # A cached connection may have gone stale; reconnect once
+            _evict_chromecast(device_ip, port)
+            chromecast = None
+            if attempt == 0:
+                logging.warning(
+                    "Broadcast failed (%s), retrying with a fresh connection", e)
+                continue
+            logging.error("Failed to broadcast message: %s", e)
+            return False
         finally:
-            zconf.close()
+            if chromecast is not None:
+                try:
+                    chromecast.quit_app()
+                except (AttributeError, ConnectionError):
+                    pass
+
+    return False
 
 
 def main() -> None:
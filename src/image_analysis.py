@@ -5,16 +5,24 @@ Async image analysis using aiohttp for OpenAI API calls.
 """
 import asyncio
 import base64
+import functools
 import json
 import logging
+import mmap
 import os
+import re
 from typing import Any, Dict, TypedDict, Union
 
-from langchain_core.messages import HumanMessage
+import orjson
 
 from .config import Config
 from .llm_factory import get_llm
 
+try:
+    import pybase64
+except ImportError:
+    pybase64 = None
+
 
 class ImageAnalysisResult(TypedDict):
     """
@@ -27,6 +35,44 @@ class ImageAnalysisResult(TypedDict):
     description: str
 
 
+# Each fence is optional so half-fenced or truncated responses are still stripped
+_CODEBLOCK_RE = re.compile(r"^(?:```(?:json)?)?\s*(.*?)\s*(?:```)?$", re.DOTALL)
+
+# Files at least this large are encoded straight from a memory map
+_MMAP_THRESHOLD = 1024 * 1024
+
+# Leading file signatures, checked before falling back to the extension
+_MIME_BY_MAGIC = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG", "image/png"),
+    (b"GIF8", "image/gif"),
+)
+
+_MIME_BY_EXT = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".webp": "image/webp",
+}
+
+
+def _b64encode_str(data) -> str:
+    """Base64-encode a bytes-like object to str, using SIMD pybase64 when it is installed."""
+    if pybase64 is not None:
+        return pybase64.b64encode_as_string(data)
+    return base64.b64encode(data).decode("ascii")
+
+
+def _sniff_mime(header: bytes, image_path: str) -> str:
+    """Return the MIME type from the file's magic bytes, else from its extension."""
+    for magic, mime in _MIME_BY_MAGIC:
+        if header.startswith(magic):
+            return mime
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "image/webp"
+    return _MIME_BY_EXT.get(os.path.splitext(image_path)[1].lower(), "image/jpeg")
+
+
 def image_to_base64_data_url(image_path: str) -> str:
     """
     Convert a local image file to a base64-encoded data URL.
@@ -37,20 +83,27 @@ def image_to_base64_data_url(image_path: str) -> str:
     Returns:
         str: Data URL string suitable for OpenAI API.
     """
-    # File size validation
-    if os.path.getsize(image_path) > Config.MAX_IMAGE_SIZE:
-        raise ValueError("Image file too large")
-
-    ext = os.path.splitext(image_path)[1].lower()
-    mime = "image/png" if ext == ".png" else "image/jpeg"
     with open(image_path, "rb") as img_file:
-        data = img_file.read()
-        b64 = base64.b64encode(data).decode("utf-8")
-        # Clear data from memory
-        del data
+        # File size validation on the open descriptor; no second path lookup
+        size = os.fstat(img_file.fileno()).st_size
+        if size > Config.MAX_IMAGE_SIZE:
+            raise ValueError("Image file too large")
+
+        if size >= _MMAP_THRESHOLD:
+            # Encode from the mapped pages to avoid a full in-memory copy
+            with mmap.mmap(img_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                mime = _sniff_mime(mapped[:12], image_path)
+                b64 = _b64encode_str(mapped)
+        else:
+            data = img_file.read()
+            mime = _sniff_mime(data[:12], image_path)
+            b64 = _b64encode_str(data)
+            # Clear data from memory
+            del data
     return f"data:{mime};base64,{b64}"
 
 
+@functools.lru_cache(maxsize=16)
 def get_prompt_from_schema(schema: type) -> str:
     """
     Generate a prompt string for the LLM based on the schema (TypedDict) docstring and fields.
@@ -69,6 +122,34 @@ def get_prompt_from_schema(schema: type) -> str:
     )
 
 
+_IMAGE_ANALYSIS_PROMPT = get_prompt_from_schema(ImageAnalysisResult)
+
+
+def _strip_markdown_fences(content: str) -> str:
+    """Remove a leading ```json and/or trailing ``` fence from an LLM response."""
+    return _CODEBLOCK_RE.match(content.strip()).group(1)
+
+
+def _resolve_provider(provider: str = None) -> str:
+    """
+    Apply the configured default provider and check it supports async image analysis.
+
+    Raises:
+        ValueError: If the provider is not OpenAI.
+    """
+    provider = (provider or Config.DEFAULT_LLM_PROVIDER).lower()
+    # Provider validation (for now only OpenAI is supported)
+    if provider != "openai":
+        raise ValueError(
+            "Only OpenAI provider supported for async image analysis")
+    return provider
+
+
+def _failed_result(description: str) -> Dict[str, Any]:
+    """Build the result reported for an image that could not be analyzed."""
+    return {"person_present": None, "description": description}
+
+
 async def analyze_image_async(
     image_path: str,
     provider: str = None,
@@ -88,82 +169,172 @@ async def analyze_image_async(
     Returns:
         Dict containing person_present and description
     """
-    # Input validation
-    if not isinstance(image_path, str) or not image_path.strip():
-        raise ValueError("Invalid image path provided")
+    provider = _resolve_provider(provider)
+    # Opening the file raises FileNotFoundError if it is missing
+    data_url = await _encode_image_async(image_path)
+    return await _analyze_data_url_async(data_url, provider)
 
-    # Use config default if no provider specified
-    if not provider:
-        provider = Config.DEFAULT_LLM_PROVIDER
 
-    # Provider validation (for now only OpenAI is supported)
-    if provider.lower() != "openai":
-        raise ValueError(
-            "Only OpenAI provider supported for async image analysis")
+async def analyze_image_bytes_async(
+    image_bytes: bytes,
+    mime: str = "image/jpeg",
+    provider: str = None,
+) -> Dict[str, Any]:
+    """
+    Analyze an in-memory encoded image without writing it to disk.
 
-    # Check if file exists
-    if not os.path.exists(image_path):
-        raise FileNotFoundError(f"Image file not found: {image_path}")
+    Args:
+        image_bytes (bytes-like): Encoded image data (e.g. a view of a cv2.imencode buffer)
+        mime (str): MIME type of the encoded image
+        provider (str): LLM provider (only 'openai' is supported)
+    Returns:
+        Dict containing person_present and description
+    """
+    if not image_bytes:
+        raise ValueError("Empty image data provided")
 
-    # Convert image to base64 data URL
-    data_url = image_to_base64_data_url(image_path)
+    if len(image_bytes) > Config.MAX_IMAGE_SIZE:
+        raise ValueError("Image data too large")
 
-    # Prepare prompt
-    prompt = get_prompt_from_schema(ImageAnalysisResult)
+    provider = _resolve_provider(provider)
+    data_url = f"data:{mime};base64,{_b64encode_str(image_bytes)}"
+    return await _analyze_data_url_async(data_url, provider)
 
-    # Get LLM using factory
+
+async def _analyze_data_url_async(data_url: str, provider: str) -> Dict[str, Any]:
+    """
+    Send one image data URL to the LLM and parse the structured result.
+
+    Args:
+        data_url (str): Base64 data URL of the image
+        provider (str): Validated LLM provider name
+    Returns:
+        Dict containing person_present and description
+    """
+    result = await _invoke_llm_json_async(
+        provider, _IMAGE_ANALYSIS_PROMPT, [data_url],
+        lambda value: isinstance(value, dict))
+    return result if result is not None else _failed_result("Analysis failed after retries")
+
+
+async def _invoke_llm_json_async(provider: str, prompt: str, data_urls: list[str],
+                                 is_valid) -> Any:
+    """
+    Send a prompt and images to the LLM and parse its JSON reply, with retries.
+
+    Empty, unparseable or invalid replies and LLM errors are retried up to
+    Config.MAX_RETRIES times with exponential backoff.
+
+    Args:
+        provider (str): Validated LLM provider name
+        prompt (str): Instruction text sent ahead of the images
+        data_urls (list[str]): Base64 data URLs of the images, in order
+        is_valid (callable): Predicate the parsed JSON must satisfy
+    Returns:
+        The parsed JSON value, or None if every attempt failed
+    """
+    # Get LLM using factory; get_llm reuses one client per configuration
     llm = get_llm(provider)
 
     # LangChain expects a list of HumanMessage objects with proper content structure
-    lc_messages = [HumanMessage(content=[
-        {"type": "text", "text": prompt},
-        {"type": "image_url", "image_url": {"url": data_url}}
-    ])]
+    from langchain_core.messages import HumanMessage
+    content = [{"type": "text", "text": prompt}]
+    content.extend({"type": "image_url", "image_url": {"url": data_url}}
+                   for data_url in data_urls)
+    lc_messages = [HumanMessage(content=content)]
 
-    # Async invoke with retry logic
     for attempt in range(Config.MAX_RETRIES):
         try:
             response = await llm.ainvoke(lc_messages)
-            content = response.content.strip() if hasattr(
-                response, 'content') else str(response).strip()
-
-            if not content:
-                logging.error("Empty response from LLM")
-                continue
-
-            # Try to parse as JSON with markdown cleanup
-            clean_content = content.strip()
-            if clean_content.startswith('```json'):
-                clean_content = clean_content[7:]
-            if clean_content.endswith('```'):
-                clean_content = clean_content[:-3]
-            clean_content = clean_content.strip()
-
-            try:
-                return json.loads(clean_content)
-            except json.JSONDecodeError:
-                logging.error("Invalid JSON from %s (attempt %d): %s",
-                              provider, attempt + 1, content[:100])
-                if attempt < Config.MAX_RETRIES - 1:
-                    await asyncio.sleep(Config.RETRY_DELAY * (2 ** attempt))
-                    continue
-                return {"person_present": None, "description": content[:200]}
-
-        except (json.JSONDecodeError, ValueError, AttributeError, TypeError, RuntimeError, OSError) as e:
-            if attempt < Config.MAX_RETRIES - 1:
-                logging.warning("LLM call failed (attempt %d/%d): %s",
-                                attempt + 1, Config.MAX_RETRIES, e)
-                await asyncio.sleep(Config.RETRY_DELAY * (2 ** attempt))
-            else:
-                logging.error("All LLM attempts failed: %s", e)
-                return {"person_present": None, "description": f"Analysis failed: {e}"}
-
-    return {"person_present": None, "description": "Analysis failed after retries"}
+            raw = response.content if hasattr(
+                response, 'content') else str(response)
+            parsed = orjson.loads(_strip_markdown_fences(raw))
+            if is_valid(parsed):
+                return parsed
+            logging.error("Unexpected response shape from %s (attempt %d): %s",
+                          provider, attempt + 1, raw[:100])
+        except orjson.JSONDecodeError:
+            logging.error("Invalid JSON from %s (attempt %d): %s",
+                          provider, attempt + 1, raw[:100])
+        except (ValueError, AttributeError, TypeError, RuntimeError, OSError) as e:
+            logging.warning("LLM call failed (attempt %d/%d): %s",
+                            attempt + 1, Config.MAX_RETRIES, e)
+        if attempt < Config.MAX_RETRIES - 1:
+            await asyncio.sleep(Config.RETRY_DELAY * (2 ** attempt))
+
+    logging.error("All LLM attempts failed for %d image(s)", len(data_urls))
+    return None
+
+
+async def _encode_image_async(image_path: str) -> str:
+    """Validate an image path and build its data URL on a worker thread."""
+    if not isinstance(image_path, str) or not image_path.strip():
+        raise ValueError("Invalid image path provided")
+    return await asyncio.to_thread(image_to_base64_data_url, image_path)
+
+
+async def analyze_images_batch_async(
+    image_paths: list[str],
+    provider: str = None,
+) -> list[Dict[str, Any]]:
+    """
+    Analyze several images with a single LLM vision call.
+
+    All readable images are sent in one message and the LLM is asked for a JSON
+    array with one result per image, so the per-request overhead is paid once.
+    Images that cannot be read are reported as failed without affecting the rest.
+
+    Args:
+        image_paths: List of image file paths
+        provider (str): LLM provider (only 'openai' is supported)
+    Returns:
+        List of analysis results in the same order as image_paths
+    """
+    if not image_paths:
+        return []
+
+    provider = _resolve_provider(provider)
+
+    encoded = await asyncio.gather(
+        *(_encode_image_async(path) for path in image_paths), return_exceptions=True)
+    results: list[Dict[str, Any] | None] = [None] * len(image_paths)
+    data_urls = []
+    for i, (path, data_url) in enumerate(zip(image_paths, encoded)):
+        if isinstance(data_url, Exception):
+            logging.error("Failed to process %s: %s", path, data_url)
+            results[i] = _failed_result("Processing failed")
+        else:
+            data_urls.append(data_url)
+    if not data_urls:
+        return results
+
+    count = len(data_urls)
+    prompt = (
+        f"You are given {count} images. Respond ONLY with a JSON array of "
+        f"{count} objects, one per image in the order given. "
+        + _IMAGE_ANALYSIS_PROMPT.replace(
+            "Respond ONLY with a JSON object matching", "Each object must match")
+    )
+    parsed = await _invoke_llm_json_async(
+        provider, prompt, data_urls,
+        lambda value: isinstance(value, list) and len(value) == count)
+    if parsed is None:
+        analyzed = [_failed_result("Analysis failed after retries") for _ in range(count)]
+    else:
+        analyzed = [item if isinstance(item, dict)
+                    else _failed_result("Invalid analysis result") for item in parsed]
+
+    # Slot the analyzed images back between the ones that failed to load
+    analyzed_iter = iter(analyzed)
+    return [result if result is not None else next(analyzed_iter) for result in results]
 
 
 async def process_multiple_images_async(image_paths: list[str]) -> list[Dict[str, Any]]:
     """
-    Process multiple images concurrently using async.
+    Process multiple images with batched LLM calls.
+
+    Images are grouped into batches of Config.LLM_BATCH_SIZE and each batch
+    is analyzed with one LLM request; batches run concurrently.
 
     Args:
         image_paths: List of image file paths
@@ -171,18 +342,21 @@ async def process_multiple_images_async(image_paths: list[str]) -> list[Dict[str
     Returns:
         List of analysis results
     """
-    tasks = [analyze_image_async(path) for path in image_paths]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    batch_size = Config.LLM_BATCH_SIZE
+    batches = [image_paths[i:i + batch_size]
+               for i in range(0, len(image_paths), batch_size)]
+    tasks = [analyze_images_batch_async(batch) for batch in batches]
+    batch_results = await asyncio.gather(*tasks, return_exceptions=True)
 
     # Handle exceptions
     processed_results = []
-    for i, result in enumerate(results):
+    for batch, result in zip(batches, batch_results):
         if isinstance(result, Exception):
-            logging.error("Failed to process %s: %s", image_paths[i], result)
-            processed_results.append(
-                {"person_present": None, "description": "Processing failed"})
+            logging.error("Failed to process %s: %s", batch, result)
+            processed_results.extend(
+                _failed_result("Processing failed") for _ in batch)
         else:
-            processed_results.append(result)
+            processed_results.extend(result)
 
     return processed_results
 
@@ -5,22 +5,47 @@ This module provides functionality to capture a single
 frame from an RTSP stream to memory.
 """
 
-import glob
+import heapq
 import logging
 import os
+import threading
 
-import cv2
+# Low-latency FFmpeg options must be in the environment before OpenCV opens
+# a stream; an explicitly configured value takes precedence.
+os.environ.setdefault(
+    "OPENCV_FFMPEG_CAPTURE_OPTIONS",
+    "rtsp_transport;tcp|fflags;nobuffer|flags;low_delay|reorder_queue_size;0|max_delay;0")
 
-from .config import Config
-from .context_managers import RTSPCapture
+import cv2  # pylint: disable=wrong-import-position
 
+from .config import (  # pylint: disable=wrong-import-position
+    RTSP_URL_SCHEME_ERROR, Config, is_supported_rtsp_url)
+from .context_managers import RTSPCapture  # pylint: disable=wrong-import-position
 
-def capture_frame_from_rtsp(rtsp_url: str) -> tuple[bool, any]:
+# Frames are processed one at a time; extra OpenCV worker threads only
+# compete with the RTSP decoder and TTS engine
+cv2.setNumThreads(Config.CV_NUM_THREADS)
+
+
+def _configure_capture(cap) -> None:
+    """Apply the low-latency buffer and timeout settings to a VideoCapture."""
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, Config.CV_BUFFER_SIZE)
+    # Note: CAP_PROP_TIMEOUT not available in all OpenCV versions
+    try:
+        cap.set(cv2.CAP_PROP_TIMEOUT, Config.RTSP_TIMEOUT *
+                Config.TIMEOUT_MULTIPLIER)
+    except AttributeError:
+        pass
+
+
+def capture_frame_from_rtsp(rtsp_url: str, out=None) -> tuple[bool, any]:
     """
     Captures a single frame from RTSP stream to memory (no disk save).
 
     Args:
         rtsp_url (str): The RTSP URL of the camera.
+        out (numpy.ndarray, optional): Buffer to decode into. Reused when its
+            shape matches the stream, avoiding a new allocation per frame.
 
     Returns:
         tuple: (success, frame) - frame is cv2 image array or None
@@ -30,24 +55,23 @@ def capture_frame_from_rtsp(rtsp_url: str) -> tuple[bool, any]:
         logging.error("Invalid RTSP URL provided")
         return False, None
 
-    if not rtsp_url.startswith(('rtsp://', 'http://', 'https://')):
-        logging.error("RTSP URL must start with rtsp://, http://, or https://")
+    if not is_supported_rtsp_url(rtsp_url):
+        logging.error(RTSP_URL_SCHEME_ERROR)
         return False, None
 
     with RTSPCapture(rtsp_url) as cap:
-        cap.set(cv2.CAP_PROP_BUFFERSIZE, Config.CV_BUFFER_SIZE)
-        # Note: CAP_PROP_TIMEOUT not available in all OpenCV versions
-        try:
-            cap.set(cv2.CAP_PROP_TIMEOUT, Config.RTSP_TIMEOUT *
-                    Config.TIMEOUT_MULTIPLIER)
-        except AttributeError:
-            pass
+        _configure_capture(cap)
 
         if not cap.isOpened():
             logging.error("Could not open RTSP stream: [URL REDACTED]")
             return False, None
 
-        ret, frame = cap.read()
+        # Flush buffered pre-roll frames without decoding them, then decode
+        # only the freshest one
+        for _ in range(Config.CV_STALE_FRAMES):
+            if not cap.grab():
+                break
+        ret, frame = cap.retrieve(out)
         if not ret:
             logging.error("Failed to capture frame from RTSP stream")
             return False, None
@@ -55,22 +79,185 @@ def capture_frame_from_rtsp(rtsp_url: str) -> tuple[bool, any]:
         return True, frame
 
 
-def _cleanup_old_images() -> None:
+class LatestFrameCapture:
+    """
+    Keeps an RTSP stream open and always serves its newest frame.
+
+    A background thread grabs (demuxes and decodes) every frame as it arrives
+    so OpenCV's internal buffer never backs up; only the frame a caller asks
+    for is converted to BGR. This replaces reconnecting and flushing stale
+    frames on every capture.
+    """
+
+    def __init__(self, rtsp_url: str):
+        """
+        Open the stream in a background grab thread.
+
+        Args:
+            rtsp_url (str): The RTSP URL of the camera.
+
+        Raises:
+            ValueError: If the URL is empty or uses an unsupported scheme.
+        """
+        if not is_supported_rtsp_url(rtsp_url):
+            raise ValueError(RTSP_URL_SCHEME_ERROR)
+        self.rtsp_url = rtsp_url
+        # Pending (seq, out) request and its (seq, ret, frame) result. The lock
+        # is held across retrieve() so an abandoned request's buffer is never
+        # written after its read() has returned.
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._request = None
+        self._result = None
+        self._frame_ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._grab_loop, name="rtsp-grab", daemon=True)
+        self._thread.start()
+
+    def _open(self):
+        """Open and configure the stream, returning None if it is unavailable."""
+        cap = cv2.VideoCapture(self.rtsp_url)
+        _configure_capture(cap)
+        if cap.isOpened():
+            return cap
+        cap.release()
+        logging.error("Could not open RTSP stream: [URL REDACTED]")
+        return None
+
+    def _grab_loop(self) -> None:
+        """Grab frames continuously, reconnecting after stream failures."""
+        cap = None
+        try:
+            while not self._stop.is_set():
+                if cap is None:
+                    cap = self._open()
+                    if cap is None:
+                        self._stop.wait(Config.RETRY_DELAY)
+                        continue
+                try:
+                    if not cap.grab():
+                        logging.warning("RTSP stream stalled, reconnecting")
+                        self._fail_pending()
+                        cap.release()
+                        cap = None
+                        continue
+                    if self._request is not None:
+                        with self._lock:
+                            if self._request is not None:
+                                seq, out = self._request
+                                # The request stays pending if retrieve() raises
+                                ret, frame = cap.retrieve(out)
+                                self._request = None
+                                self._result = (seq, ret, frame)
+                                self._frame_ready.set()
+                except (cv2.error, OSError) as e:
+                    logging.warning("RTSP capture failed (%s), reconnecting", e)
+                    self._fail_pending()
+                    cap.release()
+                    cap = None
+                    self._stop.wait(Config.RETRY_DELAY)
+        finally:
+            if cap is not None:
+                cap.release()
+
+    def _fail_pending(self) -> None:
+        """Answer a pending request with a failure instead of letting it time out."""
+        with self._lock:
+            if self._request is not None:
+                seq, _ = self._request
+                self._request = None
+                self._result = (seq, False, None)
+                self._frame_ready.set()
+
+    def read(self, out=None) -> tuple[bool, any]:
+        """
+        Return the next frame grabbed from the stream.
+
+        A request that times out is withdrawn; the grab thread never serves it
+        later or writes into its buffer once this method has returned.
+
+        Args:
+            out (numpy.ndarray, optional): Buffer to decode into when its shape
+                matches the stream.
+
+        Returns:
+            tuple: (success, frame) - frame is cv2 image array or None
+        """
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+            self._result = None
+            self._frame_ready.clear()
+            self._request = (seq, out)
+        self._frame_ready.wait(Config.RTSP_TIMEOUT)
+        with self._lock:
+            # Withdraw the request if the grab thread has not taken it yet
+            self._request = None
+            result = self._result
+        if result is None or result[0] != seq:
+            logging.error("Timed out waiting for a frame from RTSP stream")
+            return False, None
+        _, ret, frame = result
+        if not ret:
+            logging.error("Failed to capture frame from RTSP stream")
+            return False, None
+        return True, frame
+
+    def release(self) -> None:
+        """Stop the grab thread and close the stream."""
+        self._stop.set()
+        self._thread.join(timeout=Config.RTSP_TIMEOUT)
+
+
+_cleanup_lock = threading.Lock()
+
+
+def _capture_mtimes() -> list:
+    """Return (mtime, entry) for each saved capture, skipping files removed meanwhile."""
+    with os.scandir(Config.IMAGES_DIR) as entries:
+        image_files = [entry for entry in entries
+                       if entry.name.startswith("capture_")
+                       and entry.name.endswith(".jpg")]
+    mtimes = []
+    for entry in image_files:
+        try:
+            # On Windows scandir caches the stat, so this costs no extra syscall
+            mtimes.append((entry.stat().st_mtime, entry))
+        except FileNotFoundError:
+            continue
+    return mtimes
+
+
+def cleanup_old_images() -> None:
     """Remove old images to prevent disk space issues."""
+    # Each saved capture schedules a cleanup; one running pass is enough
+    if not _cleanup_lock.acquire(blocking=False):
+        logging.debug("Image cleanup already running")
+        return
     try:
-        image_files = glob.glob(os.path.join(
-            Config.IMAGES_DIR, "capture_*.jpg"))
+        try:
+            image_files = _capture_mtimes()
+        except FileNotFoundError:
+            logging.debug("Images directory does not exist yet")
+            return
         logging.debug("Found %d image files", len(image_files))
         if len(image_files) > Config.MAX_IMAGES:
-            # Sort by modification time and remove oldest
-            image_files.sort(key=os.path.getmtime)
-            files_to_remove = image_files[:-Config.MAX_IMAGES]
+            # Select only the oldest excess files instead of sorting them all
+            files_to_remove = heapq.nsmallest(
+                len(image_files) - Config.MAX_IMAGES, image_files,
+                key=lambda item: item[0])
             logging.debug("Removing %d old image files", len(files_to_remove))
-            for old_file in files_to_remove:
-                os.remove(old_file)
-                logging.debug("Removed: %s", os.path.basename(old_file))
+            for _, old_file in files_to_remove:
+                try:
+                    os.unlink(old_file.path)
+                except FileNotFoundError:
+                    continue
+                logging.debug("Removed: %s", old_file.name)
     except OSError as e:
         logging.warning("Image cleanup failed: %s", e)
+    finally:
+        _cleanup_lock.release()
 
 
 def main() -> None:
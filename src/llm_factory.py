@@ -5,12 +5,17 @@ This module provides a factory function to instantiate language model (LLM) obje
 for image processing tasks. Supported providers include Ollama (local) and OpenAI (API).
 """
 
+import functools
 import os
 from enum import Enum
+from typing import TYPE_CHECKING
 
 from dotenv import load_dotenv
-from langchain_ollama import ChatOllama
-from langchain_openai import ChatOpenAI
+
+# LangChain integrations are imported on first use; they dominate import time
+if TYPE_CHECKING:
+    from langchain_ollama import ChatOllama
+    from langchain_openai import ChatOpenAI
 
 load_dotenv()
 
@@ -23,7 +28,7 @@ class LLMProvider(Enum):
     OPENAI = "openai"
 
 
-def get_llm(provider: str = "ollama", openai_api_key: str | None = None, **kwargs) -> ChatOllama | ChatOpenAI:
+def get_llm(provider: str = "ollama", openai_api_key: str | None = None, **kwargs) -> "ChatOllama | ChatOpenAI":
     """
     Factory method to return a LangChain LLM object for image processing.
 
@@ -50,7 +55,7 @@ def get_llm(provider: str = "ollama", openai_api_key: str | None = None, **kwarg
     if provider == "ollama":
         model = kwargs.get("model", "llama3.2-vision")
         temperature = kwargs.get("temperature", 0.1)
-        return ChatOllama(model=model, temperature=temperature)
+        return _build_llm(provider, model, temperature, None)
     elif provider == "openai":
         if openai_api_key is None:
             openai_api_key = os.getenv("OPENAI_API_KEY")
@@ -59,6 +64,21 @@ def get_llm(provider: str = "ollama", openai_api_key: str | None = None, **kwarg
                 "OpenAI API key must be provided for OpenAI provider.")
         model = kwargs.get("model", "gpt-4o")  # Updated default model name
         temperature = kwargs.get("temperature", 0.1)
-        return ChatOpenAI(model=model, openai_api_key=openai_api_key, temperature=temperature)
+        return _build_llm(provider, model, temperature, openai_api_key)
     else:
         raise ValueError("Unsupported provider. Use 'ollama' or 'openai'.")
+
+
+@functools.lru_cache(maxsize=None)
+def _build_llm(provider: str, model: str, temperature: float, openai_api_key: str | None):
+    """
+    Construct the LangChain client once per distinct configuration.
+
+    Client construction validates pydantic models and sets up HTTP sessions,
+    so identical get_llm calls share one already-initialized instance.
+    """
+    if provider == "ollama":
+        from langchain_ollama import ChatOllama
+        return ChatOllama(model=model, temperature=temperature)
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(model=model, openai_api_key=openai_api_key, temperature=temperature)
@@ -4,6 +4,7 @@ notification_dispatcher.py
 Cross-platform notification dispatcher for local speakers and Google Hub devices.
 """
 
+import atexit
 import logging
 import platform
 import threading
@@ -12,6 +13,10 @@ from abc import ABC, abstractmethod
 from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 
+# Shared by all dispatchers so short-lived instances do not each spin up threads
+_SHARED_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="notif")
+atexit.register(_SHARED_EXECUTOR.shutdown)
+
 
 class NotificationTarget(Enum):
     """Enumeration of possible notification targets."""
@@ -192,11 +197,11 @@ class NotificationDispatcher:
             )
 
         # Threading support for non-blocking notifications
-        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.executor = _SHARED_EXECUTOR
 
         # Duplicate filtering
         self.last_message = ""
-        self.last_message_time = 0
+        self.last_message_time = float("-inf")
         self.min_interval = 5  # Minimum seconds between same message
 
     def dispatch(self, message: str, targets: NotificationTarget = NotificationTarget.LOCAL_SPEAKER) -> bool:
@@ -212,7 +217,8 @@ class NotificationDispatcher:
             return False
 
         # Duplicate filtering
-        current_time = time.time()
+        # Monotonic clock: immune to wall-clock adjustments
+        current_time = time.monotonic()
         if (message == self.last_message and
                 current_time - self.last_message_time < self.min_interval):
             logging.info("Skipping duplicate message: %s", message)
@@ -294,10 +300,11 @@ class NotificationDispatcher:
         return results
 
     def cleanup(self):
-        """Clean up resources including the thread pool executor."""
-        if hasattr(self, 'executor'):
-            self.executor.shutdown(wait=True)
-            logging.info("Thread pool executor shut down")
+        """Clean up resources.
+
+        The thread pool executor is shared module-wide and shut down at
+        interpreter exit, so it is left running here.
+        """
 
     def __del__(self):
         """Destructor to ensure cleanup of resources."""
@@ -1,17 +1,75 @@
 """
 Service layer for business logic orchestration.
 """
-import cv2
+import asyncio
 import logging
 import os
 import time
 from typing import Dict, Any
 
 from .config import Config
-from .computer_vision import person_detected_yolov8_frame
-from .image_analysis import analyze_image_async
+from .computer_vision import get_yolov8_process_pool, person_confidence_yolov8_frame
+from .image_analysis import analyze_image_bytes_async
 from .notification_dispatcher import NotificationDispatcher, NotificationTarget
 
+_images_dir_ready = False
+_CAPTURE_PREFIX = os.path.join(Config.IMAGES_DIR, "capture_")
+
+
+def _ensure_images_dir() -> None:
+    """Create the images directory once per process instead of per frame."""
+    global _images_dir_ready
+    if not _images_dir_ready:
+        os.makedirs(Config.IMAGES_DIR, exist_ok=True)
+        _images_dir_ready = True
+
+
+def _encode_jpeg(frame) -> memoryview:
+    """Encode a frame to JPEG in memory, returning a zero-copy view of the encoder's buffer.
+
+    Frames are first shrunk to LLM_IMAGE_MAX_DIM; vision models downsample
+    larger images anyway, so the extra pixels only cost encode time and upload size.
+    """
+    import cv2  # Deferred: OpenCV is only needed once a frame is processed
+    if Config.LLM_IMAGE_MAX_DIM > 0:
+        frame = _downscale(frame, Config.LLM_IMAGE_MAX_DIM)
+    ok, buf = cv2.imencode(
+        ".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, Config.JPEG_QUALITY])
+    if not ok:
+        raise ValueError("JPEG encoding failed")
+    return memoryview(buf).cast("B")
+
+
+def _downscale(frame, max_dim: int):
+    """Shrink a frame so its longer side is at most max_dim pixels."""
+    height, width = frame.shape[:2]
+    longest = max(height, width)
+    if longest <= max_dim:
+        return frame
+    import cv2
+    scale = max_dim / longest
+    return cv2.resize(frame, (round(width * scale), round(height * scale)),
+                      interpolation=cv2.INTER_AREA)
+
+
+def _downscale_for_detection(frame):
+    """Shrink a frame so its longer side matches the YOLO input size."""
+    return _downscale(frame, Config.YOLO_INPUT_SIZE)
+
+
+def _write_bytes(path: str, data: bytes) -> None:
+    """Write data to path with raw os.write calls, bypassing Python file buffering."""
+    # O_BINARY stops Windows from translating newlines inside the JPEG
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(path, flags, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            # os.write may write fewer bytes than asked
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
 
 class AsyncRTSPProcessingService:
     """Main service for RTSP processing workflow."""
@@ -33,6 +91,42 @@ class AsyncRTSPProcessingService:
             google_device_name=self.config.GOOGLE_DEVICE_NAME
         )
 
+        # Strong references to fire-and-forget tasks until they finish
+        self._background_tasks: set[asyncio.Task] = set()
+
+    def _run_in_background(self, coro) -> asyncio.Task:
+        """Schedule a coroutine without awaiting it."""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+    async def _save_image_async(self, image_path: str, jpeg_bytes: bytes) -> None:
+        """Write an encoded frame to disk and prune old images on a worker thread."""
+        try:
+            _ensure_images_dir()
+            await asyncio.to_thread(_write_bytes, image_path, jpeg_bytes)
+            logging.info("Image saved: %s", os.path.basename(image_path))
+        except OSError as e:
+            self.logger.error("Failed to save image %s: %s",
+                              os.path.basename(image_path), e)
+            return
+        from .image_capture import cleanup_old_images
+        await asyncio.to_thread(cleanup_old_images)
+
+    async def _detect_person_async(self, frame) -> float:
+        """Run YOLOv8 in a worker thread or, if configured, a worker process."""
+        model_path = self.config.YOLO_MODEL_PATH
+        # The full-resolution frame is kept for the JPEG/LLM path
+        frame = await asyncio.to_thread(_downscale_for_detection, frame)
+        if self.config.YOLO_WORKER_PROCESS:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                get_yolov8_process_pool(model_path),
+                person_confidence_yolov8_frame, frame, model_path)
+        return await asyncio.to_thread(
+            person_confidence_yolov8_frame, frame, model_path=model_path)
+
     async def process_frame_async(self, frame) -> bool:
         """Process single frame asynchronously."""
         # Input validation
@@ -40,57 +134,70 @@ class AsyncRTSPProcessingService:
             self.logger.error("Invalid frame provided")
             return False
 
+        import cv2  # Deferred with the encoders; needed here only for cv2.error
+
+        # Quick person detection with YOLOv8, off the event loop
         try:
-            # Quick person detection with YOLOv8
-            if not person_detected_yolov8_frame(frame, model_path=self.config.YOLO_MODEL_PATH):
-                self.logger.info("No person detected (YOLOv8)")
-                return False
+            confidence = await self._detect_person_async(frame)
+        except (OSError, ValueError, RuntimeError, cv2.error) as e:
+            self.logger.exception("YOLOv8 detection failed: %s", e)
+            return False
+        if confidence < self.config.YOLO_MIN_CONFIDENCE:
+            self.logger.info("No person detected (YOLOv8)")
+            return False
 
-            # Save frame to disk only when person detected
-            os.makedirs(self.config.IMAGES_DIR, exist_ok=True)
-            image_name = f"capture_{int(time.time())}.jpg"
-            image_path = os.path.join(self.config.IMAGES_DIR, image_name)
-            cv2.imwrite(image_path, frame)
-            logging.info("Image saved: %s", os.path.basename(image_path))
+        # Encode in memory; the frame only touches disk once confirmed
+        try:
+            jpeg_bytes = await asyncio.to_thread(_encode_jpeg, frame)
+        except (ValueError, cv2.error) as e:
+            self.logger.error("Failed to encode frame: %s", e)
+            return False
+        image_path = f"{_CAPTURE_PREFIX}{time.time_ns() // 1_000_000_000}_Detected.jpg"
 
+        if confidence >= self.config.YOLO_CONFIDENT_THRESHOLD:
+            # High-confidence detection; skip the LLM round-trip
+            self.logger.info(
+                "Person detected with confidence %.2f (YOLOv8), skipping LLM", confidence)
+            result = {"person_present": True,
+                      "description": "High-confidence YOLO detection"}
+        else:
             # Async LLM analysis
-            logging.debug("Starting LLM analysis for: %s",
-                          os.path.basename(image_path))
-            result = await analyze_image_async(
-                image_path,
-                provider=self.config.DEFAULT_LLM_PROVIDER
-            )
+            from openai import OpenAIError  # Loaded by the LLM client anyway
+            logging.debug("Starting LLM analysis for frame (%d bytes)",
+                          len(jpeg_bytes))
+            try:
+                result = await analyze_image_bytes_async(
+                    jpeg_bytes,
+                    provider=self.config.DEFAULT_LLM_PROVIDER
+                )
+            except (OSError, ValueError, RuntimeError, OpenAIError) as e:
+                self.logger.exception("LLM analysis failed: %s", e)
+                return False
             logging.debug("LLM analysis result: %s", result)
 
-            if result["person_present"]:
-                await self._handle_person_detected_async(image_path, result)
-                return True
-            else:
-                self.logger.info("Person not confirmed by LLM")
-                # Clean up image if no person confirmed
-                try:
-                    os.remove(image_path)
-                except OSError:
-                    pass
-                return False
+        # The LLM may return any JSON value; only an explicit true confirms
+        if not (isinstance(result, dict) and result.get("person_present")):
+            self.logger.info("Person not confirmed by LLM")
+            return False
 
-        except (OSError, IOError, ValueError, RuntimeError) as e:
-            self.logger.exception("Error processing frame: %s", e)
+        try:
+            await self._handle_person_detected_async(image_path, jpeg_bytes, result)
+        except (OSError, ValueError, RuntimeError) as e:
+            self.logger.exception("Error handling detection: %s", e)
             return False
+        return True
 
-    async def _handle_person_detected_async(self, image_path: str, result: Dict[str, Any]) -> None:
+    async def _handle_person_detected_async(self, image_path: str, jpeg_bytes: bytes, result: Dict[str, Any]) -> None:
         """Handle person detection event."""
-        # Rename image file
-        base, ext = os.path.splitext(image_path)
-        detected_path = f"{base}_Detected{ext}"
-        os.rename(image_path, detected_path)
-
-        # Send notification
         description = result.get("description", "Person detection unknown")
         message = self.config.BROADCAST_MESSAGE_TEMPLATE.format(
             desc=description)
 
-        success = self.dispatcher.dispatch(message, self.notification_target)
+        # Persist the confirmed frame in the background; disk is only for audit
+        self._run_in_background(self._save_image_async(image_path, jpeg_bytes))
+
+        success = await asyncio.to_thread(
+            self.dispatcher.dispatch, message, self.notification_target)
 
         if success:
             self.logger.info("Notification sent: %s", message)
@@ -0,0 +1,83 @@
+"""
+conftest.py
+
+Shared pytest fixtures for the test suite.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    """Make time.sleep a no-op so mocked retry and playback waits never block."""
+    monkeypatch.setattr('time.sleep', lambda *_args: None)
+
+
+@pytest.fixture(autouse=True)
+def clear_llm_cache():
+    """Start each test without LLM clients cached by earlier tests."""
+    from src.llm_factory import _build_llm
+    _build_llm.cache_clear()
+    yield
+    _build_llm.cache_clear()
+
+
+@pytest.fixture
+def mock_video_capture():
+    """
+    Patch cv2.VideoCapture in src.image_capture so no real stream is opened.
+
+    The returned capture is spec'd against cv2.VideoCapture and defaults to an
+    open stream that yields "fake_frame"; tests override only what they need.
+    """
+    import cv2
+    cap = Mock(spec=cv2.VideoCapture)
+    cap.isOpened.return_value = True
+    cap.grab.return_value = True
+    cap.retrieve.return_value = (True, "fake_frame")
+    with patch('src.image_capture.cv2.VideoCapture', return_value=cap) as video_capture:
+        yield video_capture
+
+
+def _build_fake_cast(host="192.168.1.100", play_error=None, wait_error=None):
+    """Build a Chromecast stand-in that records media plays and disconnects."""
+    media_controller = SimpleNamespace(
+        status=SimpleNamespace(player_state="IDLE"),
+        played=[],
+        block_until_active=lambda: None,
+    )
+
+    def play_media(url, _content_type):
+        if play_error is not None:
+            raise play_error
+        media_controller.played.append(url)
+
+    media_controller.play_media = play_media
+
+    def wait(timeout=None):
+        if wait_error is not None:
+            raise wait_error
+
+    cast = SimpleNamespace(
+        cast_info=SimpleNamespace(host=host),
+        media_controller=media_controller,
+        disconnects=0,
+        wait=wait,
+        set_volume=lambda _volume: None,
+        quit_app=lambda: None,
+    )
+
+    def disconnect():
+        cast.disconnects += 1
+
+    cast.disconnect = disconnect
+    return cast
+
+
+@pytest.fixture
+def make_fake_cast():
+    """Factory for lightweight Chromecast stubs, cheaper than building MagicMocks."""
+    return _build_fake_cast
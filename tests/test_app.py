@@ -0,0 +1,123 @@
+"""
+test_app.py
+
+Unit tests for the main capture loop in src/app.py.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import DEFAULT, AsyncMock, Mock, patch
+
+import pytest
+
+from src.app import main_async
+
+
+@pytest.fixture
+def app_mocks():
+    """Patch health checks, the service and the frame source in src.app in one pass."""
+    service = Mock()
+    service.config.CAPTURE_INTERVAL = 0
+    service.process_frame_async = AsyncMock(return_value=False)
+    with patch.multiple('src.app',
+                        run_health_checks=AsyncMock(return_value={"rtsp_stream": True}),
+                        AsyncRTSPProcessingService=Mock(return_value=service),
+                        LatestFrameCapture=DEFAULT) as mocks:
+        stream = mocks['LatestFrameCapture'].return_value
+        yield SimpleNamespace(stream=stream, capture=stream.read, service=service)
+
+
+def test_main_async_processes_frames_then_shuts_down(app_mocks):
+    """
+    Test that captured frames are handed to the worker and the loop shuts down
+    cleanly on KeyboardInterrupt.
+    """
+    app_mocks.capture.side_effect = [(True, "frame1"), (False, None), KeyboardInterrupt()]
+
+    asyncio.run(main_async())
+
+    app_mocks.service.process_frame_async.assert_awaited_once_with("frame1")
+
+
+@patch('src.app.asyncio.sleep', new_callable=AsyncMock)
+@patch('src.app.time')
+def test_main_async_sleep_accounts_for_capture_time(mock_time, mock_sleep, app_mocks):
+    """
+    Test that time spent capturing is subtracted from the wait before the next capture.
+    """
+    app_mocks.service.config.CAPTURE_INTERVAL = 10
+    # Loop start, then the clock after a capture that took 0.5s
+    mock_time.monotonic.side_effect = [100.0, 100.5]
+    app_mocks.capture.side_effect = [(False, None), KeyboardInterrupt()]
+
+    asyncio.run(main_async())
+
+    mock_sleep.assert_awaited_once_with(9.5)
+
+
+def test_main_async_reuses_processed_frame_buffers(app_mocks):
+    """
+    Test that a frame buffer is handed back to the capture call once the worker
+    has finished processing it.
+    """
+    frame = object()
+    app_mocks.capture.side_effect = [(True, frame), (False, None), KeyboardInterrupt()]
+
+    asyncio.run(main_async())
+
+    assert app_mocks.capture.call_args_list[0].kwargs['out'] is None
+    assert app_mocks.capture.call_args_list[1].kwargs['out'] is frame
+
+
+async def _run_inline(func, *args, **kwargs):
+    """Stand-in for asyncio.to_thread that never yields to the event loop."""
+    return func(*args, **kwargs)
+
+
+@patch('src.app.asyncio.to_thread', new=_run_inline)
+@patch('src.app.asyncio.sleep', new_callable=AsyncMock)
+def test_main_async_shutdown_discards_queued_frames(_mock_sleep, app_mocks):
+    """
+    Test that frames still queued at shutdown are dropped rather than processed.
+    """
+    app_mocks.capture.side_effect = [(True, "frame1"), (True, "frame2"), KeyboardInterrupt()]
+
+    asyncio.run(main_async())
+
+    app_mocks.service.process_frame_async.assert_not_awaited()
+
+
+def test_main_async_releases_capture_on_shutdown(app_mocks):
+    """
+    Test that the persistent RTSP capture is released when the loop stops.
+    """
+    app_mocks.capture.side_effect = KeyboardInterrupt()
+
+    asyncio.run(main_async())
+
+    app_mocks.stream.release.assert_called_once()
+
+
+def test_main_async_worker_survives_processing_error(app_mocks):
+    """
+    Test that an exception while processing one frame does not stop the worker
+    from processing the next.
+    """
+    app_mocks.service.process_frame_async.side_effect = [ConnectionError("LLM down"), False]
+
+    def capture(**_kwargs):
+        if app_mocks.capture.call_count == 1:
+            return True, "frame1"
+        if app_mocks.service.process_frame_async.await_count == 1:
+            return True, "frame2"
+        if app_mocks.service.process_frame_async.await_count >= 2:
+            raise KeyboardInterrupt()
+        return False, None
+
+    app_mocks.capture.side_effect = capture
+
+    # A dead worker never takes frame2, so bound the run instead of hanging
+    asyncio.run(asyncio.wait_for(main_async(), timeout=5))
+
+    assert [c.args[0] for c in app_mocks.service.process_frame_async.await_args_list] == [
+        "frame1", "frame2"]
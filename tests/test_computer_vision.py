@@ -0,0 +1,59 @@
+"""
+test_computer_vision.py
+
+Unit tests for the YOLOv8 helpers in src/computer_vision.py.
+"""
+
+import sys
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+
+from src.computer_vision import (YOLOv8ModelSingleton, _best_person_confidence,
+                                 person_detected_yolov8)
+
+
+def make_boxes(cls, conf):
+    """Build a stand-in for ultralytics Boxes already on the CPU."""
+    boxes = SimpleNamespace(cls=np.array(cls, dtype=np.float32),
+                            conf=np.array(conf, dtype=np.float32))
+    boxes.cpu = lambda: boxes
+    boxes.numpy = lambda: boxes
+    return boxes
+
+
+@pytest.fixture
+def mock_yolo_class():
+    """Stand in for ultralytics.YOLO and reset the model cache around the test."""
+    yolo_class = Mock()
+    model = yolo_class.return_value
+    model.names = {0: 'person'}
+    model.return_value = [SimpleNamespace(boxes=make_boxes([0], [0.9]))]
+    YOLOv8ModelSingleton._instances.clear()
+    with patch.dict(sys.modules, {'ultralytics': SimpleNamespace(YOLO=yolo_class)}):
+        yield yolo_class
+    YOLOv8ModelSingleton._instances.clear()
+
+
+def test_yolo_model_loaded_once(mock_yolo_class):
+    """
+    Test that repeated detections reuse the loaded model instead of reloading the weights.
+    """
+    assert person_detected_yolov8("images/test.jpg", model_path="yolov8n.pt")
+    assert person_detected_yolov8("images/test.jpg", model_path="yolov8n.pt")
+    assert mock_yolo_class.call_count == 1
+
+
+@pytest.mark.parametrize("cls, conf, expected", [
+    ([0, 2, 0], [0.4, 0.95, 0.7], 0.7),
+    ([2, 2], [0.9, 0.8], 0.0),
+    ([], [], 0.0),
+])
+def test_best_person_confidence(cls, conf, expected):
+    """
+    Test that only person boxes contribute to the reported confidence.
+    """
+    names = {0: 'person', 2: 'car'}
+    assert _best_person_confidence(make_boxes(cls, conf), names) == pytest.approx(expected)
@@ -0,0 +1,65 @@
+"""
+test_config.py
+
+Unit tests for configuration validation in src/config.py.
+"""
+
+import re
+
+import pytest
+
+from src.config import RTSP_URL_SCHEME_ERROR, Config
+
+
+@pytest.fixture
+def valid_config(monkeypatch, tmp_path):
+    """Set the required settings to values that pass validation."""
+    model_path = tmp_path / "yolov8n.pt"
+    model_path.write_bytes(b"")
+    monkeypatch.setattr(Config, "RTSP_URL", "rtsp://camera/stream")
+    monkeypatch.setattr(Config, "GOOGLE_DEVICE_IP", "192.168.1.100")
+    monkeypatch.setattr(Config, "OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(Config, "YOLO_MODEL_PATH", str(model_path))
+    return Config
+
+
+@pytest.mark.parametrize("url", ["rtsp://camera/stream", "rtsps://camera/stream",
+                                 "https://camera/stream"])
+def test_validate_accepts_supported_url_schemes(valid_config, monkeypatch, url):
+    """
+    Test that every scheme the capture code supports, including rtsps://, passes validation.
+    """
+    monkeypatch.setattr(valid_config, "RTSP_URL", url)
+    valid_config.validate()
+
+
+def test_validate_rejects_unsupported_url_scheme(valid_config, monkeypatch):
+    """
+    Test that an RTSP_URL with an unsupported scheme fails validation.
+    """
+    monkeypatch.setattr(valid_config, "RTSP_URL", "ftp://camera/stream")
+    with pytest.raises(ValueError, match=re.escape(RTSP_URL_SCHEME_ERROR)):
+        valid_config.validate()
+
+
+@pytest.mark.parametrize("size", [0, -640])
+def test_validate_rejects_non_positive_yolo_input_size(valid_config, monkeypatch, size):
+    """
+    Test that YOLO_INPUT_SIZE must be positive, since frames are scaled to it.
+    """
+    monkeypatch.setattr(valid_config, "YOLO_INPUT_SIZE", size)
+    with pytest.raises(ValueError, match="YOLO_INPUT_SIZE must be positive"):
+        valid_config.validate()
+
+
+@pytest.mark.parametrize("threads, valid", [(-1, True), (0, True), (4, True), (-2, False)])
+def test_validate_cv_num_threads(valid_config, monkeypatch, threads, valid):
+    """
+    Test that CV_NUM_THREADS accepts the values cv2.setNumThreads does.
+    """
+    monkeypatch.setattr(valid_config, "CV_NUM_THREADS", threads)
+    if valid:
+        valid_config.validate()
+    else:
+        with pytest.raises(ValueError, match="CV_NUM_THREADS"):
+            valid_config.validate()
@@ -0,0 +1,105 @@
+"""
+test_google_broadcast.py
+
+Unit tests for Google Hub broadcasting in src/google_broadcast.py.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pychromecast
+import pytest
+
+from src import google_broadcast
+from src.google_broadcast import discover_all_chromecasts, send_message_to_google_hub
+
+
+@pytest.fixture(autouse=True)
+def clear_cast_cache():
+    """Isolate tests from Chromecast connections cached by earlier tests."""
+    google_broadcast._cast_cache.clear()
+    yield
+    google_broadcast._cast_cache.clear()
+
+
+@patch('src.google_broadcast.zeroconf.Zeroconf')
+@patch('src.google_broadcast.pychromecast.Chromecast')
+def test_send_message_reuses_connection(mock_chromecast_cls, _mock_zconf, make_fake_cast):
+    """
+    Test that repeated broadcasts to the same device connect only once.
+    """
+    fake_cast = make_fake_cast("192.168.1.100")
+    mock_chromecast_cls.return_value = fake_cast
+
+    assert send_message_to_google_hub("hello", "192.168.1.100") is True
+    assert send_message_to_google_hub("again", "192.168.1.100") is True
+
+    assert mock_chromecast_cls.call_count == 1
+    assert len(fake_cast.media_controller.played) == 2
+
+
+@patch('src.google_broadcast.zeroconf.Zeroconf')
+@patch('src.google_broadcast.pychromecast.Chromecast')
+def test_send_message_reconnects_after_stale_connection(mock_chromecast_cls, _mock_zconf,
+                                                        make_fake_cast):
+    """
+    Test that a failed broadcast on a cached connection reconnects and retries once.
+    """
+    stale = make_fake_cast(play_error=ConnectionError("stale"))
+    fresh = make_fake_cast()
+    mock_chromecast_cls.side_effect = [stale, fresh]
+
+    assert send_message_to_google_hub("hello", "192.168.1.100") is True
+
+    assert mock_chromecast_cls.call_count == 2
+    assert stale.disconnects == 1
+    assert len(fresh.media_controller.played) == 1
+
+
+@patch('src.google_broadcast.zeroconf.Zeroconf')
+@patch('src.google_broadcast.pychromecast.Chromecast')
+def test_send_message_unreachable_device_times_out(mock_chromecast_cls, _mock_zconf,
+                                                   make_fake_cast):
+    """
+    Test that a device that never becomes ready fails the broadcast, disconnects
+    each attempt and leaves nothing cached.
+    """
+    timeout = pychromecast.error.RequestTimeout("wait", 15)
+    casts = [make_fake_cast(wait_error=timeout), make_fake_cast(wait_error=timeout)]
+    mock_chromecast_cls.side_effect = casts
+
+    assert send_message_to_google_hub("hello", "192.168.1.100") is False
+
+    assert [cast.disconnects for cast in casts] == [1, 1]
+    assert not google_broadcast._cast_cache
+
+
+def test_send_message_invalid_volume():
+    """
+    Test that an out-of-range volume is rejected before connecting.
+    """
+    assert send_message_to_google_hub("hello", "192.168.1.100", volume=2.0) is False
+
+
+@patch('src.google_broadcast.time.sleep')
+@patch('src.google_broadcast.zeroconf.Zeroconf')
+@patch('src.google_broadcast.CastBrowser')
+def test_discover_stops_early_for_target(mock_browser_cls, _mock_zconf, mock_sleep):
+    """
+    Test that discovery returns as soon as the target IP resolves instead of
+    waiting out the full timeout.
+    """
+    cast_info = SimpleNamespace(host="192.168.1.100", friendly_name="Kitchen", model_name="Hub")
+
+    def start_discovery():
+        listener = mock_browser_cls.call_args[0][0]
+        listener.browser.devices = {"uuid-1": cast_info}
+        listener.add_cast("uuid-1", None)
+
+    mock_browser_cls.return_value.start_discovery.side_effect = start_discovery
+
+    devices = discover_all_chromecasts(target_ip="192.168.1.100", discovery_timeout=30)
+
+    assert list(devices) == ["192.168.1.100"]
+    mock_sleep.assert_not_called()
+    mock_browser_cls.return_value.stop_discovery.assert_called_once()
@@ -4,8 +4,14 @@ test_image_capture.py
 Unit tests for the RTSP image capture utility in src/image_capture.py.
 """
 
-from unittest.mock import Mock, patch
-from src.image_capture import capture_frame_from_rtsp
+import os
+import threading
+
+import cv2
+import pytest
+
+from src.config import Config
+from src.image_capture import LatestFrameCapture, capture_frame_from_rtsp, cleanup_old_images
 
 
 class TestImageCapture:
@@ -13,16 +19,11 @@ class TestImageCapture:
     Test suite for the capture_frame_from_rtsp function, covering success, failure, and custom timestamp scenarios.
     """
 
-    @patch('src.image_capture.cv2.VideoCapture')
     def test_capture_image_success(self, mock_video_capture):
         """
-        Test that capture_image_from_rtsp saves an image successfully when the stream opens and frame is read.
+        Test that capture_frame_from_rtsp returns the frame when the stream opens and a frame is read.
         """
-        # Setup
-        mock_cap = Mock()
-        mock_cap.isOpened.return_value = True
-        mock_cap.read.return_value = (True, "fake_frame")
-        mock_video_capture.return_value = mock_cap
+        mock_cap = mock_video_capture.return_value
 
         # Execute
         success, frame = capture_frame_from_rtsp("rtsp://test.url")
@@ -32,19 +33,20 @@ class TestImageCapture:
         assert frame == "fake_frame"
         mock_video_capture.assert_called_once_with("rtsp://test.url")
         mock_cap.isOpened.assert_called_once()
-        mock_cap.read.assert_called_once()
+        # A one-frame buffer keeps the decoded frame close to live
+        mock_cap.set.assert_any_call(cv2.CAP_PROP_BUFFERSIZE, 1)
+        assert mock_cap.grab.call_count == 2
+        mock_cap.retrieve.assert_called_once()
         mock_cap.release.assert_called_once()
         # No file operations since we only return frame in memory
 
-    @patch('src.image_capture.cv2.VideoCapture')
     def test_capture_image_stream_not_opened(self, mock_video_capture):
         """
-        Test that capture_image_from_rtsp returns None if the RTSP stream cannot be opened.
+        Test that capture_frame_from_rtsp returns no frame if the RTSP stream cannot be opened.
         """
         # Setup
-        mock_cap = Mock()
+        mock_cap = mock_video_capture.return_value
         mock_cap.isOpened.return_value = False
-        mock_video_capture.return_value = mock_cap
 
         # Execute
         success, frame = capture_frame_from_rtsp("rtsp://invalid.url")
@@ -55,16 +57,13 @@ class TestImageCapture:
         # Release is always called in finally block
         mock_cap.release.assert_called_once()
 
-    @patch('src.image_capture.cv2.VideoCapture')
     def test_capture_image_read_failed(self, mock_video_capture):
         """
-        Test that capture_image_from_rtsp returns None if reading a frame from the stream fails.
+        Test that capture_frame_from_rtsp returns no frame if reading a frame from the stream fails.
         """
         # Setup
-        mock_cap = Mock()
-        mock_cap.isOpened.return_value = True
-        mock_cap.read.return_value = (False, None)
-        mock_video_capture.return_value = mock_cap
+        mock_cap = mock_video_capture.return_value
+        mock_cap.retrieve.return_value = (False, None)
 
         # Execute
         success, frame = capture_frame_from_rtsp("rtsp://test.url")
@@ -74,20 +73,171 @@ class TestImageCapture:
         assert frame is None
         mock_cap.release.assert_called_once()
 
-    @patch('src.image_capture.cv2.VideoCapture')
     def test_capture_image_custom_timestamp(self, mock_video_capture):
         """
-        Test that capture_image_from_rtsp uses the correct timestamp in the saved image filename.
+        Test that capture_frame_from_rtsp hands back the retrieved frame as-is; naming the
+        saved file by timestamp is left to the caller.
         """
-        # Setup
-        mock_cap = Mock()
-        mock_cap.isOpened.return_value = True
-        mock_cap.read.return_value = (True, "fake_frame")
-        mock_video_capture.return_value = mock_cap
-
         # Execute
         success, frame = capture_frame_from_rtsp("rtsp://test.url")
 
         # Assert
         assert success is True
         assert frame == "fake_frame"
+
+    def test_capture_image_invalid_scheme(self, mock_video_capture):
+        """
+        Test that capture_frame_from_rtsp rejects URLs with an unsupported scheme without opening a stream.
+        """
+        success, frame = capture_frame_from_rtsp("ftp://test.url")
+
+        assert success is False
+        assert frame is None
+        mock_video_capture.assert_not_called()
+
+
+def test_cleanup_old_images_keeps_newest(tmp_path, monkeypatch):
+    """
+    Test that cleanup_old_images removes the oldest captures beyond MAX_IMAGES.
+    """
+    monkeypatch.setattr(Config, "IMAGES_DIR", str(tmp_path))
+    monkeypatch.setattr(Config, "MAX_IMAGES", 2)
+    for i in range(4):
+        img_path = tmp_path / f"capture_{i}.jpg"
+        img_path.write_bytes(b"\xff\xd8\xff")
+        os.utime(img_path, (i, i))
+
+    cleanup_old_images()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "capture_2.jpg", "capture_3.jpg"]
+
+
+def test_cleanup_old_images_skips_files_removed_concurrently(tmp_path, monkeypatch):
+    """
+    Test that a capture deleted by another cleanup mid-prune does not stop the rest.
+    """
+    monkeypatch.setattr(Config, "IMAGES_DIR", str(tmp_path))
+    monkeypatch.setattr(Config, "MAX_IMAGES", 1)
+    for i in range(4):
+        img_path = tmp_path / f"capture_{i}.jpg"
+        img_path.write_bytes(b"\xff\xd8\xff")
+        os.utime(img_path, (i, i))
+    real_unlink = os.unlink
+
+    def racing_unlink(path):
+        real_unlink(path)
+        if path.endswith("capture_0.jpg"):
+            raise FileNotFoundError(path)
+
+    monkeypatch.setattr('src.image_capture.os.unlink', racing_unlink)
+
+    cleanup_old_images()
+
+    assert [p.name for p in tmp_path.iterdir()] == ["capture_3.jpg"]
+
+
+def test_latest_frame_capture_decodes_on_demand(mock_video_capture):
+    """
+    Test that LatestFrameCapture keeps grabbing in the background but only
+    retrieves (decodes) a frame when one is read.
+    """
+    mock_cap = mock_video_capture.return_value
+    mock_cap.retrieve.side_effect = [(True, "frame1"), (True, "frame2")]
+
+    stream = LatestFrameCapture("rtsp://test.url")
+    try:
+        assert stream.read() == (True, "frame1")
+        assert stream.read() == (True, "frame2")
+    finally:
+        stream.release()
+
+    mock_video_capture.assert_called_once_with("rtsp://test.url")
+    assert mock_cap.retrieve.call_count == 2
+    assert mock_cap.grab.call_count >= 2
+    mock_cap.release.assert_called_once()
+
+
+def test_latest_frame_capture_rejects_invalid_scheme(mock_video_capture):
+    """
+    Test that LatestFrameCapture refuses unsupported URL schemes before opening a stream.
+    """
+    with pytest.raises(ValueError):
+        LatestFrameCapture("ftp://test.url")
+    mock_video_capture.assert_not_called()
+
+
+def test_latest_frame_capture_timeout_abandons_request(mock_video_capture, monkeypatch):
+    """
+    Test that a read that times out is never served later and its buffer is never written.
+    """
+    monkeypatch.setattr(Config, "RTSP_TIMEOUT", 0.05)
+    stalled = threading.Event()
+    mock_cap = mock_video_capture.return_value
+    # The stream stalls until the first read has given up
+    mock_cap.grab.side_effect = lambda: stalled.wait(5)
+    mock_cap.retrieve.return_value = (True, "fresh")
+    abandoned = object()
+
+    stream = LatestFrameCapture("rtsp://test.url")
+    try:
+        assert stream.read(out=abandoned) == (False, None)
+        stalled.set()
+        monkeypatch.setattr(Config, "RTSP_TIMEOUT", 5)
+        assert stream.read() == (True, "fresh")
+    finally:
+        stream.release()
+
+    assert all(call.args[0] is not abandoned for call in mock_cap.retrieve.call_args_list)
+
+
+def test_latest_frame_capture_read_waits_for_inflight_retrieve(mock_video_capture, monkeypatch):
+    """
+    Test that read() does not return while the grab thread is still decoding into its buffer.
+    """
+    monkeypatch.setattr(Config, "RTSP_TIMEOUT", 0.05)
+    writes = []
+
+    def slow_retrieve(out):
+        writes.append("start")
+        # Outlasts the read timeout; time.sleep is stubbed out for the suite
+        threading.Event().wait(0.2)
+        writes.append("end")
+        return True, out
+
+    mock_video_capture.return_value.retrieve.side_effect = slow_retrieve
+    buffer = object()
+
+    stream = LatestFrameCapture("rtsp://test.url")
+    try:
+        stream.read(out=buffer)
+        assert writes == ["start", "end"]
+    finally:
+        stream.release()
+
+
+def test_latest_frame_capture_recovers_from_opencv_error(mock_video_capture, monkeypatch):
+    """
+    Test that a cv2.error from the stream reconnects instead of killing the grab thread.
+    """
+    monkeypatch.setattr(Config, "RETRY_DELAY", 0)
+    mock_cap = mock_video_capture.return_value
+
+    def grab():
+        if mock_cap.grab.call_count == 1:
+            raise cv2.error("decoder hiccup")
+        return True
+
+    mock_cap.grab.side_effect = grab
+    mock_cap.retrieve.return_value = (True, "frame1")
+
+    stream = LatestFrameCapture("rtsp://test.url")
+    try:
+        # A read pending when the error hits fails fast; the next one succeeds
+        stream.read()
+        assert stream.read() == (True, "frame1")
+        assert stream._thread.is_alive()
+    finally:
+        stream.release()
+
+    assert mock_video_capture.call_count == 2
@@ -9,22 +9,18 @@ import pytest
 from src.llm_factory import get_llm, LLMProvider
 
 
-def test_get_llm_ollama():
+@pytest.mark.parametrize("provider, model", [
+    (LLMProvider.OLLAMA, "llama3.2-vision"),
+    (LLMProvider.OPENAI, "gpt-4o"),
+    ("ollama", "llama3.2-vision"),
+])
+def test_get_llm_returns_client(monkeypatch, provider, model):
     """
-    Test that get_llm returns a valid LLM instance for the Ollama provider.
-    """
-    llm = get_llm(provider=LLMProvider.OLLAMA,
-                  model="llama3.2-vision", temperature=0.1)
-    assert llm is not None
-    assert hasattr(llm, "invoke")
-
-
-def test_get_llm_openai(monkeypatch):
-    """
-    Test that get_llm returns a valid LLM instance for the OpenAI provider when API key is set.
+    Test that get_llm returns a valid LLM instance for each provider, given as
+    an LLMProvider or a plain string, when the OpenAI API key is set.
     """
     monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
-    llm = get_llm(provider=LLMProvider.OPENAI, model="gpt-4o", temperature=0.1)
+    llm = get_llm(provider=provider, model=model, temperature=0.1)
     assert llm is not None
     assert hasattr(llm, "invoke")
 
@@ -44,3 +40,13 @@ def test_get_llm_missing_api_key(monkeypatch):
     monkeypatch.delenv("OPENAI_API_KEY", raising=False)
     with pytest.raises(ValueError):
         get_llm(provider=LLMProvider.OPENAI)
+
+
+def test_get_llm_reuses_client_for_same_config():
+    """
+    Test that identical get_llm calls return the same client and a different
+    configuration builds a new one.
+    """
+    llm = get_llm(provider="ollama", model="llama3.2-vision", temperature=0.1)
+    assert get_llm(provider=LLMProvider.OLLAMA, model="llama3.2-vision", temperature=0.1) is llm
+    assert get_llm(provider="ollama", model="llama3.2-vision", temperature=0.5) is not llm
@@ -0,0 +1,27 @@
+"""
+test_notification_dispatcher.py
+
+Unit tests for the notification dispatcher in src/notification_dispatcher.py.
+"""
+
+from unittest.mock import Mock, patch
+
+from src.notification_dispatcher import NotificationDispatcher, NotificationTarget
+
+
+@patch('src.notification_dispatcher.LocalSpeakerProvider')
+def test_dispatch_skips_duplicate_within_interval(mock_provider_cls):
+    """
+    Test that the same message is sent once when repeated within min_interval.
+    """
+    provider = Mock()
+    provider.send_notification.return_value = True
+    mock_provider_cls.return_value = provider
+    dispatcher = NotificationDispatcher()
+
+    with patch('src.notification_dispatcher.time.monotonic', side_effect=[100.0, 102.0, 110.0]):
+        assert dispatcher.dispatch("hello", NotificationTarget.LOCAL_SPEAKER)
+        assert dispatcher.dispatch("hello", NotificationTarget.LOCAL_SPEAKER)
+        assert dispatcher.dispatch("hello", NotificationTarget.LOCAL_SPEAKER)
+
+    assert provider.send_notification.call_count == 2
@@ -5,42 +5,70 @@ This module contains unit tests for functions in the image_analysis module,
 specifically testing image-to-base64 conversion, prompt generation from schema,
 and image analysis results processing.
 """
+import asyncio
+import base64
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
 import pytest
-from src.image_analysis import image_to_base64_data_url, get_prompt_from_schema, ImageAnalysisResult
+from src.image_analysis import (
+    image_to_base64_data_url, get_prompt_from_schema, ImageAnalysisResult,
+    analyze_images_batch_async, analyze_image_bytes_async, _strip_markdown_fences)
+
+PERSON_PRESENT_JSON = '{"person_present": true, "description": "man"}'
+PERSON_PRESENT_DICT = json.loads(PERSON_PRESENT_JSON)
+
+
+@pytest.fixture
+def mock_llm(monkeypatch):
+    """Route get_llm to a single mock LLM whose ainvoke tests can configure."""
+    llm = Mock()
+    llm.ainvoke = AsyncMock()
+    monkeypatch.setattr('src.image_analysis.get_llm', lambda *_args, **_kwargs: llm)
+    return llm
 
 
-def test_image_to_base64_data_url_png(tmp_path):
+@pytest.mark.parametrize("name, header, prefix", [
+    ("test.png", b"\x89PNG\r\n\x1a\n", "data:image/png;base64,"),
+    ("test.jpg", b"\xff\xd8\xff", "data:image/jpeg;base64,"),
+])
+def test_image_to_base64_data_url(tmp_path, name, header, prefix):
     """
-    Test the image_to_base64_data_url function.
+    Test the image_to_base64_data_url function for PNG and JPEG images.
 
-    This test creates a temporary PNG image file, converts it to a 
+    This test creates a temporary image file, converts it to a 
     base64 data URL using the image_to_base64_data_url function, 
-    and asserts that the resulting URL starts with the correct prefix.
+    and asserts that the resulting URL carries the MIME type for its extension.
 
     Args:
         tmp_path: A pytest fixture that provides a temporary directory unique to the test invocation.
     """
-    img_path = tmp_path / "test.png"
-    img_path.write_bytes(b"\x89PNG\r\n\x1a\n")
+    img_path = tmp_path / name
+    img_path.write_bytes(header)
     url = image_to_base64_data_url(str(img_path))
-    assert url.startswith("data:image/png;base64,")
+    assert url.startswith(prefix)
 
 
-def test_image_to_base64_data_url_jpg(tmp_path):
+def test_image_to_base64_data_url_uses_magic_bytes(tmp_path):
     """
-    Test the image_to_base64_data_url function with a JPEG image.
+    Test that the MIME type follows the file signature when it disagrees with the extension.
+    """
+    img_path = tmp_path / "mislabeled.jpg"
+    img_path.write_bytes(b"\x89PNG\r\n\x1a\n")
+    url = image_to_base64_data_url(str(img_path))
+    assert url.startswith("data:image/png;base64,")
 
-    This test creates a temporary JPEG image file, converts it to a 
-    base64 data URL using the image_to_base64_data_url function, 
-    and asserts that the resulting URL starts with the correct prefix.
 
-    Args:
-        tmp_path: A pytest fixture that provides a temporary directory unique to the test invocation.
+def test_image_to_base64_data_url_large_file(tmp_path):
     """
-    img_path = tmp_path / "test.jpg"
-    img_path.write_bytes(b"\xff\xd8\xff")
+    Test that image_to_base64_data_url encodes files above the mmap threshold correctly.
+    """
+    img_path = tmp_path / "large.jpg"
+    data = b"\xff\xd8\xff" + b"\x00" * (2 * 1024 * 1024)
+    img_path.write_bytes(data)
     url = image_to_base64_data_url(str(img_path))
-    assert url.startswith("data:image/jpeg;base64,")
+    assert url == "data:image/jpeg;base64," + base64.b64encode(data).decode()
 
 
 def test_image_to_base64_data_url_missing():
@@ -73,3 +101,127 @@ def test_get_prompt_from_schema():
     assert "person_present" in prompt
     assert "description" in prompt
     assert prompt.startswith("Respond ONLY with a JSON object")
+
+
+def test_analyze_images_batch_async_single_call(mock_llm, tmp_path):
+    """
+    Test that analyze_images_batch_async sends all images in one LLM call
+    and splits the returned JSON array into per-image results.
+    """
+    paths = []
+    for name in ("a.jpg", "b.jpg"):
+        img_path = tmp_path / name
+        img_path.write_bytes(b"\xff\xd8\xff")
+        paths.append(str(img_path))
+
+    mock_llm.ainvoke.return_value = SimpleNamespace(content=(
+        f'```json\n[{PERSON_PRESENT_JSON},'
+        ' {"person_present": false, "description": "empty"}]\n```'))
+
+    results = asyncio.run(analyze_images_batch_async(paths, provider="openai"))
+
+    assert [r["person_present"] for r in results] == [True, False]
+    mock_llm.ainvoke.assert_awaited_once()
+    content = mock_llm.ainvoke.call_args[0][0][0].content
+    assert sum(part["type"] == "image_url" for part in content) == 2
+
+
+def test_analyze_image_bytes_async_parses_fenced_json(mock_llm):
+    """
+    Test that a fenced JSON response is parsed with string contents left intact.
+    """
+    mock_llm.ainvoke.return_value = SimpleNamespace(content=(
+        '```json\n{"person_present": true, "description": "man\'s red hat, None visible"}\n```'))
+
+    result = asyncio.run(analyze_image_bytes_async(b"\xff\xd8\xff", provider="openai"))
+
+    assert result == {"person_present": True, "description": "man's red hat, None visible"}
+
+
+def test_analyze_image_bytes_async_builds_data_url(mock_llm):
+    """
+    Test that analyze_image_bytes_async sends in-memory bytes as a JPEG data URL.
+    """
+    mock_llm.ainvoke.return_value = SimpleNamespace(
+        content=PERSON_PRESENT_JSON)
+
+    result = asyncio.run(analyze_image_bytes_async(
+        b"\xff\xd8\xff", provider="openai"))
+
+    assert result == PERSON_PRESENT_DICT
+    content = mock_llm.ainvoke.call_args[0][0][0].content
+    assert content[1]["image_url"]["url"] == "data:image/jpeg;base64,/9j/"
+
+
+@pytest.mark.parametrize("content", [
+    '```json\n{"a": 1}\n```',
+    '```\n{"a": 1}\n```',
+    '```json\n{"a": 1}',
+    '{"a": 1}\n```',
+    '  {"a": 1}  ',
+])
+def test_strip_markdown_fences(content):
+    """
+    Test that _strip_markdown_fences returns the bare JSON body for fenced and unfenced responses.
+    """
+    assert _strip_markdown_fences(content) == '{"a": 1}'
+
+
+def test_analyze_images_batch_async_missing_file(mock_llm, tmp_path):
+    """
+    Test that a missing image is reported as failed while the rest of the batch is analyzed.
+    """
+    img_path = tmp_path / "a.jpg"
+    img_path.write_bytes(b"\xff\xd8\xff")
+    mock_llm.ainvoke.return_value = SimpleNamespace(content=f"[{PERSON_PRESENT_JSON}]")
+
+    results = asyncio.run(analyze_images_batch_async(
+        ["not_a_file.jpg", str(img_path)], provider="openai"))
+
+    assert results == [{"person_present": None, "description": "Processing failed"},
+                       PERSON_PRESENT_DICT]
+    content = mock_llm.ainvoke.call_args[0][0][0].content
+    assert sum(part["type"] == "image_url" for part in content) == 1
+
+
+def test_analyze_images_batch_async_replaces_non_dict_entries(mock_llm, tmp_path):
+    """
+    Test that array entries that are not objects fall back to a per-image failure.
+    """
+    paths = []
+    for name in ("a.jpg", "b.jpg"):
+        img_path = tmp_path / name
+        img_path.write_bytes(b"\xff\xd8\xff")
+        paths.append(str(img_path))
+    mock_llm.ainvoke.return_value = SimpleNamespace(content=f'[{PERSON_PRESENT_JSON}, "oops"]')
+
+    results = asyncio.run(analyze_images_batch_async(paths, provider="openai"))
+
+    assert results[0] == PERSON_PRESENT_DICT
+    assert results[1]["person_present"] is None
+
+
+def test_analyze_image_bytes_async_retries_non_object_response(mock_llm, monkeypatch):
+    """
+    Test that a reply that is not a JSON object is retried like invalid JSON.
+    """
+    monkeypatch.setattr('src.image_analysis.Config.RETRY_DELAY', 0)
+    mock_llm.ainvoke.side_effect = [SimpleNamespace(content="[]"),
+                                    SimpleNamespace(content=PERSON_PRESENT_JSON)]
+
+    result = asyncio.run(analyze_image_bytes_async(b"\xff\xd8\xff", provider="openai"))
+
+    assert result == PERSON_PRESENT_DICT
+    assert mock_llm.ainvoke.await_count == 2
+
+
+@pytest.mark.parametrize("analyze, arg", [
+    (analyze_image_bytes_async, b"\xff\xd8\xff"),
+    (analyze_images_batch_async, ["a.jpg"]),
+])
+def test_analysis_rejects_unsupported_provider(analyze, arg):
+    """
+    Test that every analysis entry point rejects providers other than OpenAI.
+    """
+    with pytest.raises(ValueError, match="Only OpenAI provider"):
+        asyncio.run(analyze(arg, provider="ollama"))
@@ -0,0 +1,125 @@
+"""
+test_services.py
+
+Unit tests for the frame-processing helpers in src/services.py.
+"""
+
+import asyncio
+import os
+from unittest.mock import AsyncMock, patch
+
+import cv2
+import numpy as np
+import pytest
+
+from src.services import (
+    AsyncRTSPProcessingService, _downscale_for_detection, _encode_jpeg, _write_bytes)
+
+
+@pytest.fixture
+def service():
+    """Build a service without validating config or creating real notifiers."""
+    with patch('src.services.Config.validate'), \
+            patch('src.services.NotificationDispatcher'):
+        svc = AsyncRTSPProcessingService()
+    svc.dispatcher.dispatch.return_value = True
+    return svc
+
+
+def test_downscale_for_detection_shrinks_large_frame():
+    """
+    Test that a 1080p frame is resized so its longer side matches the YOLO input size.
+    """
+    frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+    small = _downscale_for_detection(frame)
+    assert small.shape == (360, 640, 3)
+
+
+def test_downscale_for_detection_keeps_small_frame():
+    """
+    Test that frames already within the YOLO input size are returned unchanged.
+    """
+    frame = np.zeros((240, 320, 3), dtype=np.uint8)
+    assert _downscale_for_detection(frame) is frame
+
+
+def test_encode_jpeg_downscales_for_llm(monkeypatch):
+    """
+    Test that frames are shrunk to LLM_IMAGE_MAX_DIM before JPEG encoding.
+    """
+    monkeypatch.setattr('src.services.Config.LLM_IMAGE_MAX_DIM', 1024)
+    frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+    decoded = cv2.imdecode(np.frombuffer(_encode_jpeg(frame), np.uint8), cv2.IMREAD_COLOR)
+    assert decoded.shape == (576, 1024, 3)
+
+
+def test_write_bytes_completes_short_writes(tmp_path, monkeypatch):
+    """
+    Test that _write_bytes keeps writing until every byte is on disk.
+    """
+    real_write = os.write
+    monkeypatch.setattr('src.services.os.write',
+                        lambda fd, data: real_write(fd, bytes(data[:3])))
+    path = tmp_path / "capture.jpg"
+    data = b"\xff\xd8\r\n\x00\n\xff\xd9"
+    _write_bytes(str(path), data)
+    assert path.read_bytes() == data
+
+
+@patch('src.services.analyze_image_bytes_async', new_callable=AsyncMock)
+def test_process_frame_low_confidence_skips_llm(mock_analyze, service):
+    """
+    Test that frames below YOLO_MIN_CONFIDENCE are dropped without an LLM call.
+    """
+    with patch.object(service, '_detect_person_async', AsyncMock(return_value=0.1)):
+        assert asyncio.run(service.process_frame_async("frame")) is False
+    mock_analyze.assert_not_awaited()
+
+
+@patch('src.services._encode_jpeg', return_value=b"jpeg")
+@patch('src.services.analyze_image_bytes_async', new_callable=AsyncMock)
+def test_process_frame_high_confidence_skips_llm(mock_analyze, _mock_encode, service):
+    """
+    Test that high-confidence YOLO detections notify without an LLM round-trip.
+    """
+    with patch.object(service, '_detect_person_async', AsyncMock(return_value=0.95)), \
+            patch.object(service, '_save_image_async', AsyncMock()):
+        assert asyncio.run(service.process_frame_async("frame")) is True
+    mock_analyze.assert_not_awaited()
+    service.dispatcher.dispatch.assert_called_once()
+
+
+@patch('src.services._encode_jpeg', return_value=b"jpeg")
+@patch('src.services.analyze_image_bytes_async', new_callable=AsyncMock)
+def test_process_frame_llm_failure_returns_false(mock_analyze, _mock_encode, service):
+    """
+    Test that an LLM error for a medium-confidence frame is logged and reported as no detection.
+    """
+    mock_analyze.side_effect = RuntimeError("boom")
+    with patch.object(service, '_detect_person_async', AsyncMock(return_value=0.5)):
+        assert asyncio.run(service.process_frame_async("frame")) is False
+    service.dispatcher.dispatch.assert_not_called()
+
+
+@patch('src.services._encode_jpeg', side_effect=cv2.error("encode failed"))
+def test_process_frame_encode_error_returns_false(_mock_encode, service):
+    """
+    Test that an OpenCV error while encoding is logged and reported as no detection.
+    """
+    with patch.object(service, '_detect_person_async', AsyncMock(return_value=0.95)):
+        assert asyncio.run(service.process_frame_async("frame")) is False
+    service.dispatcher.dispatch.assert_not_called()
+
+
+@pytest.mark.parametrize("result", [{"description": "no flag"}, ["not", "a", "dict"]])
+@patch('src.services._encode_jpeg', return_value=b"jpeg")
+@patch('src.services.analyze_image_bytes_async', new_callable=AsyncMock)
+def test_process_frame_malformed_llm_result_returns_false(mock_analyze, _mock_encode,
+                                                          service, result):
+    """
+    Test that an LLM result without a person_present flag is treated as no detection.
+    """
+    mock_analyze.return_value = result
+    with patch.object(service, '_detect_person_async', AsyncMock(return_value=0.5)):
+        assert asyncio.run(service.process_frame_async("frame")) is False
+    service.dispatcher.dispatch.assert_not_called()